@@ -1,128 +1,374 @@
 # camera_worker.py
+import logging
 import cv2
 import time
+import threading
+from contextlib import contextmanager
 import numpy as np
-from PySide6.QtCore import QObject, Signal, Slot, QThread, QMutex, QMutexLocker
+from PySide6.QtCore import QObject, Signal, Slot, QThread
 
 # Import the new processor
-from mediapipe_processor import MediaPipeProcessor
+from mediapipe_processor import (MediaPipeProcessor, PoseLandmarkerProcessor, pose_landmarker_model_path,
+                                 MODEL_DIR, POSE_LANDMARKER_MODELS)
+from frame_buffers import FrameExchange
+
+logger = logging.getLogger(__name__)
+
+# A grab() that returns faster than this was served from the driver's buffer
+# (i.e. a stale frame) rather than waiting on the sensor.
+STALE_GRAB_SECONDS = 0.004
+# Upper bound on time spent draining stale frames before decoding one.
+GRAB_FLUSH_BUDGET_SECONDS = 0.030
+# Capture backends tried in order. Media Foundation negotiates MJPG at high
+# resolutions/fps; DirectShow is kept as a fallback for older drivers.
+CAPTURE_BACKENDS = (cv2.CAP_MSMF, cv2.CAP_DSHOW)
 
 class CameraWorker(QObject):
     """
     Handles camera operations and MediaPipe processing in a separate thread.
-    Emits processed frames (with landmarks drawn) via the frame_ready signal.
+    Processed BGR frames (with landmarks drawn) are kept in a latest-frame
+    exchange; frame_ready notifies the consumer (the DisplayWorker), which
+    then calls take_latest().
     """
-    frame_ready = Signal(np.ndarray) # Emit numpy array frame (now annotated)
+    frame_ready = Signal()           # Signal that a new annotated frame is available
     finished = Signal()              # Signal when the run loop finishes
     error = Signal(str)             # Signal for emitting error messages
-    landmarks_ready = Signal(object)   # Signal for emitting landmarks positions           
+    landmarks_ready = Signal(np.ndarray) # Signal for emitting landmarks as a (33, 4) x/y/z/visibility array
+    model_changed = Signal(int)      # Live model switch done, carries the active model_complexity
+    model_switch_failed = Signal(int, str) # Requested model_complexity and error, the old model keeps running
 
-    def __init__(self, camera_index=0, parent=None):
+    def __init__(self, camera_index=0, target_infer_fps=15, model_complexity=0,
+                 static_image_mode=False, capture_size=(640, 480), capture_fps=30,
+                 capture_fourcc="MJPG", inference_size=(512, 512), parent=None):
         super().__init__(parent)
-        self._running = False
         self._camera_index = camera_index
+        # MediaPipe settings: 0 = Lite, 1 = Full, 2 = Heavy. static_image_mode must stay
+        # False for live video so landmarks are tracked across frames instead of re-detected.
+        # Lite is the default, it is several times faster than Full for a modest accuracy loss.
+        self._model_complexity = model_complexity
+        self._pending_complexity = None # Set by set_model_complexity(), applied by the run loop
+        self._pending_lock = threading.Lock()
+        self._static_image_mode = static_image_mode
+        # Resolution requested from the camera (the driver may pick the closest it supports)
+        # and the box frames are downscaled to fit before pose inference.
+        self._capture_size = capture_size
+        self._capture_fps = capture_fps
+        # Pixel format requested from the camera, e.g. "MJPG" or "YUY2" (None keeps the driver default)
+        self._capture_fourcc = capture_fourcc
+        self._inference_size = inference_size
+        # Pose inference is throttled to this rate, frames in between are shown
+        # with the processor's most recent landmarks redrawn on them.
+        self._infer_interval = 1.0 / target_infer_fps if target_infer_fps else 0.0
+        self._last_infer_ts = 0.0
         self._cap = None
         self._media_pipe_processor = None # Placeholder for the processor
-        self._mutex = QMutex()
+        # Set by stop(), a plain Event is all the loop needs to see the request
+        self._stop_event = threading.Event()
+        # Set while a step that cannot check the stop request is running (MediaPipe
+        # init, opening the camera, switching models, cleanup), see in_blocking_step()
+        self._blocking = threading.Event()
+        # Pooled frames that retrieve() decodes into and that are handed to the
+        # consumer, latest frame wins (shape known once the camera is open)
+        self._frames = FrameExchange("capture")
+        self._frame_shape = None
+        # Whether _grab_latest() has to drain the driver queue (BUFFERSIZE not honoured)
+        self._drain_grabs = True
 
     @Slot()
     def run(self):
         """The main loop for capturing, processing, and emitting frames."""
-        print("CameraWorker: Run method started.")
-        self._mutex.lock()
-        self._running = True
-        self._mutex.unlock()
-
+        logger.info("Run method started.")
         # --- Initialize MediaPipe Processor ---
         # Do this inside the run method so it happens in the worker thread
         try:
-            print("CameraWorker: Initializing MediaPipeProcessor...")
-            self._media_pipe_processor = MediaPipeProcessor(
-                # Adjust parameters here if needed, e.g., model_complexity=0 for lower-end hardware
-                model_complexity=1
-            )
-            print("CameraWorker: MediaPipeProcessor initialized.")
+            with self._blocking_step():
+                self._media_pipe_processor = self._create_processor(self._model_complexity)
         except Exception as e:
             error_msg = f"Failed to initialize MediaPipe: {e}"
-            print(f"CameraWorker: {error_msg}")
+            logger.error("%s", error_msg)
             self.error.emit(error_msg)
-            self._mutex.lock()
-            self._running = False
-            self._mutex.unlock()
-            self.finished.emit()
+            self._stop_event.set()
+            self._finish()
             return # Exit if MediaPipe fails
 
+        if self._stop_requested():
+            logger.info("Stop requested during MediaPipe initialization, not opening the camera.")
+            self._finish()
+            return
+
         # --- Initialize Camera ---
-        print(f"CameraWorker: Attempting to open camera {self._camera_index}...")
-        self._cap = cv2.VideoCapture(self._camera_index, cv2.CAP_DSHOW)
+        # Opening (MSMF in particular) and configuring the camera can take seconds
+        with self._blocking_step():
+            opened = self._open_camera()
+            if opened and not self._stop_requested():
+                self._configure_camera()
+
+        if self._stop_requested():
+            logger.info("Stop requested while opening the camera.")
+            self._finish()
+            return
 
-        if not self._cap or not self._cap.isOpened():
+        if not opened:
             error_msg = f"Error: Could not open camera index {self._camera_index}."
-            print(f"CameraWorker: {error_msg}")
+            logger.error("%s", error_msg)
             self.error.emit(error_msg)
-            self._mutex.lock()
-            self._running = False
-            self._mutex.unlock()
-            # Clean up MediaPipe if camera fails after its initialization
-            if self._media_pipe_processor:
-                 self._media_pipe_processor.close()
-            self.finished.emit()
+            self._stop_event.set()
+            self._finish() # Also cleans up MediaPipe, initialized before the camera
             return
 
-        print(f"CameraWorker: Camera {self._camera_index} opened successfully.")
-
         # --- Main Loop ---
-        while True:
-            self._mutex.lock()
-            should_run = self._running
-            self._mutex.unlock()
+        # Bind everything the loop touches per frame to locals once, the camera,
+        # processor and signals are fixed for the whole session.
+        stop_requested = self._stop_event.is_set
+        interruption_requested = QThread.currentThread().isInterruptionRequested
+        grab_latest = self._grab_latest
+        retrieve = self._retrieve_into_buffer
+        process = self._media_pipe_processor.process_frame
+        draw = self._media_pipe_processor.draw_latest
+        publish = self._frames.publish
+        emit_frame = self.frame_ready.emit
+        emit_landmarks = self.landmarks_ready.emit
+        monotonic = time.monotonic
+        infer_interval = self._infer_interval
 
-            if not should_run:
-                break # Exit loop if stop() was called
+        while not (stop_requested() or interruption_requested()): # Exit loop once stop() was called
+            if self._pending_complexity is not None:
+                # Model switched from the GUI: rebuild the processor between frames
+                with self._blocking_step():
+                    process, draw = self._switch_model()
+                continue # Re-check the stop request, the switch may have taken a while
 
-            ret, frame = self._cap.read() # Read a frame
+            # Advance to the newest frame without decoding, then decode only that one
+            if grab_latest():
+                ret, frame = retrieve()
+            else:
+                ret, frame = False, None
             if ret:
                 # --- Process with MediaPipe ---
                 try:
-                    # Pass the raw frame to the processor
-                    annotated_frame, pose_results = self._media_pipe_processor.process_frame(frame)
+                    now = monotonic()
+                    if now - self._last_infer_ts >= infer_interval:
+                        self._last_infer_ts = now
+                        annotated_frame, landmarks = process(frame)
 
+                        if landmarks is not None: # A new pose, not one already emitted
+                            emit_landmarks(landmarks)
+                    else:
+                        # Interstitial frame: skip inference, redraw the processor's latest pose
+                        annotated_frame = draw(frame)
                     # --- Emit the processed frame ---
                     # The frame now potentially has the skeleton drawn on it
-                    self.frame_ready.emit(annotated_frame)
-
-                    if pose_results and pose_results.pose_landmarks:
-                        self.landmarks_ready.emit(pose_results.pose_landmarks)
+                    if publish(annotated_frame):
+                        emit_frame() # Otherwise the consumer has not taken the previous frame yet
 
                 except Exception as e:
-                    print(f"CameraWorker: Error processing frame with MediaPipe: {e}")
+                    logger.error("Error processing frame with MediaPipe: %s", e)
                     # Decide how to handle processing errors, e.g., emit original frame?
                     # self.frame_ready.emit(frame) # Emit original if processing fails
                     pass # Or just skip emitting this frame
             else:
-                print("CameraWorker: Warning - Could not read frame.")
+                logger.warning("Could not read frame.")
                 time.sleep(0.01)
 
         # --- Cleanup ---
-        print("CameraWorker: Exiting run loop.")
-        if self._cap:
+        logger.info("Exiting run loop.")
+        self._finish()
+
+
+    def _open_camera(self):
+        """Tries each capture backend in turn. Returns True once one has opened the camera."""
+        logger.info("Attempting to open camera %s...", self._camera_index)
+        for backend in CAPTURE_BACKENDS:
+            if self._stop_requested():
+                return False # Don't start another (slow) open attempt
+            self._cap = cv2.VideoCapture(self._camera_index, backend)
+            if self._cap.isOpened():
+                logger.info("Using capture backend %s.", self._cap.getBackendName())
+                logger.info("Camera %s opened successfully.", self._camera_index)
+                return True
             self._cap.release()
-            print("CameraWorker: Camera released.")
         self._cap = None
+        return False
+
+    def _configure_camera(self):
+        """Requests buffering, pixel format, size and rate, and logs what was negotiated."""
+        cap = self._cap
+        # Keep the driver queue as short as possible so we never process stale frames.
+        # Not every backend honours this, then _grab_latest() drains whatever is left.
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        buffer_size = cap.get(cv2.CAP_PROP_BUFFERSIZE)
+        self._drain_grabs = buffer_size != 1
+        if self._drain_grabs:
+            logger.info("Backend reports a buffer size of %s, draining stale frames.", buffer_size)
+        # Request the pixel format first (before the size, some drivers only offer large
+        # sizes as MJPG). With MJPG the camera sends compressed frames, a fraction of the
+        # USB bandwidth of raw YUY2, and OpenCV decodes them with libjpeg-turbo.
+        if self._capture_fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self._capture_fourcc))
+        if self._capture_size:
+            # Ask for a smaller stream, less to transfer, decode and downscale per frame
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self._capture_size[0])
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self._capture_size[1])
+        if self._capture_fps:
+            cap.set(cv2.CAP_PROP_FPS, self._capture_fps)
+
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._frame_shape = (height, width, 3)
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        fourcc_name = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+        logger.info("Negotiated %sx%s @ %.0f fps, format %r.", width, height, cap.get(cv2.CAP_PROP_FPS), fourcc_name)
+
+    def _finish(self):
+        """Releases the camera, then MediaPipe, and emits finished."""
+        # Marked as blocking so a forced stop waits for it: the camera is released
+        # first, then MediaPipe can take a moment to shut down its graph
+        with self._blocking_step():
+            if self._cap:
+                self._cap.release()
+                logger.debug("Camera released.")
+            self._cap = None
+            self._frames.clear()
 
-        if self._media_pipe_processor:
-            self._media_pipe_processor.close() # Release MediaPipe resources
-            self._media_pipe_processor = None
+            if self._media_pipe_processor:
+                self._media_pipe_processor.close() # Release MediaPipe resources
+                self._media_pipe_processor = None
 
         self.finished.emit()
-        print("CameraWorker: Run method finished.")
+        logger.info("Run method finished.")
+
+    def _stop_requested(self):
+        """True once stop() was called or the owning thread was asked to stop."""
+        return self._stop_event.is_set() or QThread.currentThread().isInterruptionRequested()
+
+    @contextmanager
+    def _blocking_step(self):
+        """Marks a step that does not check the stop request while it runs."""
+        self._blocking.set()
+        try:
+            yield
+        finally:
+            self._blocking.clear()
+
+    def in_blocking_step(self):
+        """
+        Returns True while the worker is in a step that cannot be interrupted.
+
+        Safe to call from any thread. The thread must not be terminated then:
+        it may be opening or releasing the camera.
+        """
+        return self._blocking.is_set()
+
+    def _create_processor(self, model_complexity):
+        """Builds the pose processor for the given model complexity (in the worker thread)."""
+        model_path = pose_landmarker_model_path(model_complexity)
+        if model_path and not self._static_image_mode:
+            # Prefer the Tasks API (GPU delegate, async live stream) when its model is installed
+            logger.info("Initializing PoseLandmarkerProcessor (%s)...", model_path)
+            processor = PoseLandmarkerProcessor(model_path, inference_size=self._inference_size)
+        else:
+            if not self._static_image_mode:
+                # Not an error, but without the model the app silently runs the slower
+                # synchronous CPU path, so say which file would enable the Tasks API
+                logger.warning("Pose Landmarker model %s not found in %s, falling back to the synchronous "
+                               "mediapipe.solutions.pose processor (CPU). See README.md to install the models.",
+                               POSE_LANDMARKER_MODELS.get(model_complexity), MODEL_DIR)
+            logger.info("Initializing MediaPipeProcessor (model_complexity=%s)...", model_complexity)
+            processor = MediaPipeProcessor(
+                static_image_mode=self._static_image_mode,
+                model_complexity=model_complexity,
+                inference_size=self._inference_size
+            )
+        logger.info("%s initialized.", type(processor).__name__)
+        return processor
+
+    def _switch_model(self):
+        """
+        Replaces the processor with one for the pending model complexity.
 
+        The new processor is built before the old one is closed, so a failure
+        keeps the current model running. Returns the (process, draw) methods
+        of whichever processor is active afterwards.
+        """
+        with self._pending_lock: # Take and clear together, a newer request is never lost
+            complexity, self._pending_complexity = self._pending_complexity, None
+        if complexity is None: # Already taken by an earlier check, nothing to do
+            return self._media_pipe_processor.process_frame, self._media_pipe_processor.draw_latest
+        if complexity == self._model_complexity:
+            self.model_changed.emit(complexity) # Nothing to rebuild, but confirm the selection
+        else:
+            try:
+                processor = self._create_processor(complexity)
+            except Exception as e:
+                # Not the error signal: that one means the session is over
+                logger.error("Failed to switch to model_complexity=%s, keeping the current model: %s", complexity, e)
+                self.model_switch_failed.emit(complexity, str(e))
+            else:
+                self._media_pipe_processor.close()
+                self._media_pipe_processor = processor
+                self._model_complexity = complexity
+                self.model_changed.emit(complexity)
+        return self._media_pipe_processor.process_frame, self._media_pipe_processor.draw_latest
+
+    def set_model_complexity(self, model_complexity):
+        """
+        Switches the pose model (0 = Lite, 1 = Full, 2 = Heavy) while running.
+
+        Safe to call from any thread. The run loop blocks this worker's event
+        loop, so this is a plain method rather than a queued slot: the value is
+        picked up before the next frame. The outcome is reported through
+        model_changed or model_switch_failed.
+        """
+        with self._pending_lock:
+            self._pending_complexity = model_complexity
+
+    def take_latest(self):
+        """
+        Returns the most recent annotated BGR frame, or None if there is nothing new.
+
+        Safe to call from any thread. The buffer is not reused by the worker
+        until the next frame is taken.
+        """
+        return self._frames.take()
+
+    def _retrieve_into_buffer(self):
+        """Decodes the grabbed frame in place into a free pooled buffer."""
+        buf = self._frames.acquire(self._frame_shape)
+        ret, frame = self._cap.retrieve(buf)
+        if ret and frame is not buf:
+            # The camera reported a different size than it delivers, adopt the real one
+            logger.warning("Camera delivers frames of shape %s, reallocating buffers.", frame.shape)
+            self._frame_shape = frame.shape
+        return ret, frame
+
+    def _grab_latest(self):
+        """
+        Grabs (without decoding) the newest frame. A single grab() when the driver
+        buffers one frame, otherwise grabs until its buffer is drained.
+
+        Returns True if at least one frame was grabbed and can be retrieve()d.
+        """
+        if not self._drain_grabs:
+            return self._cap.grab()
+        deadline = time.monotonic() + GRAB_FLUSH_BUDGET_SECONDS
+        grabbed = False
+        while True:
+            grab_start = time.monotonic()
+            if not self._cap.grab():
+                return grabbed
+            grabbed = True
+            grab_end = time.monotonic()
+            # A grab that had to wait for the sensor delivered a fresh frame
+            if grab_end - grab_start > STALE_GRAB_SECONDS or grab_end >= deadline:
+                return True
 
     @Slot()
     def stop(self):
-        """Requests the worker loop to stop."""
-        print("CameraWorker: Stop requested.")
-        self._mutex.lock()
-        self._running = False
-        self._mutex.unlock()
+        """Requests the worker loop to stop. Safe to call from any thread."""
+        logger.info("Stop requested.")
+        self._stop_event.set()
+        # Also flag the owning thread, so anything polling QThread.isInterruptionRequested() sees it
+        thread = self.thread()
+        if thread is not None:
+            thread.requestInterruption()
 
@@ -0,0 +1,69 @@
+# display_worker.py
+import logging
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Slot
+
+from frame_buffers import FrameExchange, fit_size
+
+logger = logging.getLogger(__name__)
+
+class DisplayWorker(QObject):
+    """
+    Prepares annotated camera frames for display in its own thread.
+
+    Runs an event loop (no blocking run method): each time the camera worker
+    publishes a frame, the newest one is scaled to the video label size. Frames
+    stay BGR, Qt wraps them as Format_BGR888, so no colour conversion pass is
+    needed. The result is published for the GUI, which is notified via
+    frame_ready and calls take_latest().
+    """
+    frame_ready = Signal() # Signal that a display-ready BGR frame is available
+
+    def __init__(self, camera_worker, parent=None):
+        super().__init__(parent)
+        self._camera_worker = camera_worker
+        # (width, height), None means keep the capture size. Only touched in this
+        # worker's thread (set_display_size is a queued slot), so no lock
+        self._display_size = None
+        self._frames = FrameExchange("display")
+
+    @Slot(int, int)
+    def set_display_size(self, width, height):
+        """Sets the area frames should be scaled to fit (keeping aspect ratio)."""
+        self._display_size = (width, height)
+
+    @Slot()
+    def convert_and_scale(self):
+        """Takes the newest camera frame, scales it into a display buffer and publishes it."""
+        frame = self._camera_worker.take_latest()
+        if frame is None:
+            return # Already handled, nothing newer since the last notification
+
+        try:
+            h, w = frame.shape[:2]
+            display_size = self._display_size
+            out_w, out_h = fit_size(w, h, *display_size) if display_size else (w, h)
+            display_buf = self._frames.acquire((out_h, out_w, 3))
+
+            if (out_w, out_h) == (w, h):
+                # Still copied: the camera buffer goes back to the camera worker on our
+                # next take, while the GUI may keep showing this frame
+                np.copyto(display_buf, frame)
+            else:
+                cv2.resize(frame, (out_w, out_h), dst=display_buf, interpolation=cv2.INTER_LINEAR)
+        except cv2.error as e:
+            logger.error("OpenCV error preparing frame: %s", e)
+            return
+
+        if self._frames.publish(display_buf):
+            self.frame_ready.emit() # Otherwise the GUI has a notification pending already
+
+    def take_latest(self):
+        """
+        Returns the most recent display-ready BGR frame, or None if there is nothing new.
+
+        The buffer is not reused until the next frame is taken, so it can be
+        wrapped in a QImage without copying.
+        """
+        return self._frames.take()
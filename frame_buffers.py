@@ -0,0 +1,94 @@
+# frame_buffers.py
+import logging
+import numpy as np
+from PySide6.QtCore import QMutex, QMutexLocker
+
+logger = logging.getLogger(__name__)
+
+# Number of reusable frame buffers per exchange. This is triple buffering:
+# one being written, one published, one held by the consumer, so a buffer the
+# consumer is reading is never overwritten.
+FRAME_POOL_SIZE = 3
+
+
+def fit_size(src_width, src_height, max_width, max_height):
+    """Returns the largest (width, height) that fits the bounds while keeping the source aspect ratio."""
+    scale = min(max_width / src_width, max_height / src_height)
+    return max(1, int(src_width * scale)), max(1, int(src_height * scale))
+
+
+class FrameExchange:
+    """
+    Hands pooled frame buffers from a producer thread to a consumer thread.
+
+    The producer acquire()s a free buffer, fills it and publish()es it,
+    overwriting any frame the consumer has not taken yet (latest frame wins).
+    The consumer take()s the newest frame and owns that buffer until its next
+    take(), so it can wrap the memory without copying.
+
+    publish() reports whether the consumer needs a notification: while a
+    published frame is still waiting to be taken, one is already on its way,
+    so at most one notification per exchange is ever queued.
+    """
+    def __init__(self, name, pool_size=FRAME_POOL_SIZE):
+        self._name = name
+        self._pool_size = pool_size
+        self._lock = QMutex()
+        self._pool = []
+        self._index = 0
+        self._latest = None # Published, not yet taken
+        self._held = None   # Taken by the consumer, still in use
+
+    def acquire(self, shape):
+        """
+        Returns a buffer of the given shape that is neither published nor held.
+
+        Producer side only. The pool is reallocated when the shape changes.
+        """
+        shape = tuple(shape)
+        if not self._pool or self._pool[0].shape != shape:
+            logger.debug("FrameExchange[%s]: Allocating %s buffers of shape %s.", self._name, self._pool_size, shape)
+            self._pool = [np.empty(shape, np.uint8) for _ in range(self._pool_size)]
+            self._index = 0
+
+        with QMutexLocker(self._lock):
+            busy = (self._latest, self._held)
+        for _ in range(len(self._pool)):
+            buf = self._pool[self._index]
+            self._index = (self._index + 1) % len(self._pool)
+            if not any(buf is b for b in busy):
+                return buf
+        raise RuntimeError("No free frame buffer") # Unreachable with pool_size >= 3
+
+    def publish(self, frame):
+        """
+        Makes frame the latest one, dropping any frame the consumer has not taken.
+
+        Returns True if the consumer should be notified, False if an earlier
+        notification is still pending (it will pick up this frame instead).
+        """
+        with QMutexLocker(self._lock):
+            notify = self._latest is None
+            self._latest = frame
+        return notify
+
+    def take(self):
+        """
+        Returns the most recent published frame and empties the slot.
+
+        Safe to call from any thread. Returns None if nothing new has been
+        published since the last call.
+        """
+        with QMutexLocker(self._lock):
+            frame = self._latest
+            self._latest = None
+            if frame is not None:
+                self._held = frame
+        return frame
+
+    def clear(self):
+        """Drops all buffers, e.g. once the producer has stopped."""
+        with QMutexLocker(self._lock):
+            self._latest = None
+            self._held = None
+        self._pool = []
@@ -0,0 +1,90 @@
+# kinematics.py
+"""
+Joint angles from pose landmarks.
+
+Each angle is measured at the middle landmark of an (a, b, c) triple, between
+the segments b->a and b->c. The angles are computed by a Numba-compiled kernel
+over the whole (N, 3) coordinate array; if Numba is not installed the same API
+falls back to vectorized numpy.
+"""
+import logging
+import math
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.warning("Numba not available, joint angles fall back to numpy.")
+    NUMBA_AVAILABLE = False
+
+# --- Joint definitions ---
+# (name, (a, b, c)) with MediaPipe pose landmark indices, the angle is at b
+JOINTS = (
+    ("Left Elbow", (11, 13, 15)),
+    ("Right Elbow", (12, 14, 16)),
+    ("Left Shoulder", (23, 11, 13)),
+    ("Right Shoulder", (24, 12, 14)),
+    ("Left Hip", (11, 23, 25)),
+    ("Right Hip", (12, 24, 26)),
+    ("Left Knee", (23, 25, 27)),
+    ("Right Knee", (24, 26, 28)),
+    ("Left Ankle", (25, 27, 31)),
+    ("Right Ankle", (26, 28, 32)),
+)
+JOINT_NAMES = tuple(name for name, _ in JOINTS)
+JOINT_TRIPLES = np.array([triple for _, triple in JOINTS], dtype=np.int32)
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _joint_angles_kernel(coords, triples):
+        k = triples.shape[0]
+        angles = np.empty(k, np.float32)
+        for j in range(k):
+            a = triples[j, 0]
+            b = triples[j, 1]
+            c = triples[j, 2]
+            v1x = coords[a, 0] - coords[b, 0]
+            v1y = coords[a, 1] - coords[b, 1]
+            v1z = coords[a, 2] - coords[b, 2]
+            v2x = coords[c, 0] - coords[b, 0]
+            v2y = coords[c, 1] - coords[b, 1]
+            v2z = coords[c, 2] - coords[b, 2]
+            # atan2(|v1 x v2|, v1 . v2) stays accurate near 0 and 180 degrees, where
+            # acos of the normalized dot product loses most of its float32 precision
+            cx = v1y * v2z - v1z * v2y
+            cy = v1z * v2x - v1x * v2z
+            cz = v1x * v2y - v1y * v2x
+            cross = math.sqrt(cx * cx + cy * cy + cz * cz)
+            dot = v1x * v2x + v1y * v2y + v1z * v2z
+            # Coincident landmarks give atan2(0, 0) = 0
+            angles[j] = math.degrees(math.atan2(cross, dot))
+        return angles
+
+
+def compute_joint_angles(coords, triples=JOINT_TRIPLES):
+    """
+    Computes the angle at the middle landmark of each triple.
+
+    Args:
+        coords: (N, 3) float32 array of landmark x, y, z (e.g. landmarks[:, :3]).
+        triples: (K, 3) int32 array of (a, b, c) landmark indices, defaults to JOINTS.
+
+    Returns:
+        (K,) float32 array of angles in degrees, in [0, 180].
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        return _joint_angles_kernel(coords, triples)
+
+    # --- numpy fallback ---
+    v1 = coords[triples[:, 0]] - coords[triples[:, 1]]
+    v2 = coords[triples[:, 2]] - coords[triples[:, 1]]
+    cross = np.linalg.norm(np.cross(v1, v2), axis=1)
+    dot = (v1 * v2).sum(axis=1)
+    # Coincident landmarks give atan2(0, 0) = 0, like the kernel
+    return np.degrees(np.arctan2(cross, dot)).astype(np.float32)
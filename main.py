@@ -1,6 +1,7 @@
+import logging
+import os
 import sys
 import cv2
-import numpy as np
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -10,37 +11,75 @@ from PySide6.QtWidgets import (
     QPushButton,
     QDockWidget
 )
-from PySide6.QtCore import Qt, QThread, Slot
-from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtCore import Qt, QThread, QTimer, Slot, Signal, QEvent
+from PySide6.QtGui import QImage, QPixmap, QAction, QActionGroup
 from widgets.databar_widget import DatabarContentWidget
+
+logger = logging.getLogger(__name__)
+
 try:
     from widgets.sidebar_widget import SidebarContentWidget
 except ImportError as e:
-    print(f"Error importing SidebarContentWidget: {e}")
-    print("Make sure 'widgets/sidebar_widget.py' exists and the 'widgets' folder is in your Python path.")
+    logger.error("Error importing SidebarContentWidget: %s", e)
+    logger.error("Make sure 'widgets/sidebar_widget.py' exists and the 'widgets' folder is in your Python path.")
     # Provide a fallback dummy class if needed for the app to run partially
     class SidebarContentWidget(QWidget):
         def __init__(self, parent=None):
             super().__init__(parent)
             layout = QVBoxLayout(self)
             layout.addWidget(QLabel("Error: Sidebar content failed to load."))
-            print("Using dummy SidebarContentWidget due to import error.")
+            logger.warning("Using dummy SidebarContentWidget due to import error.")
 
 from camera_worker import CameraWorker
+from display_worker import DisplayWorker
+
+# MediaPipe Pose model variants offered in the menu: (label, model_complexity)
+POSE_MODELS = [("Lite", 0), ("Full", 1), ("Heavy", 2)]
+# How long closing the window waits for the camera thread before considering terminate()
+CAMERA_STOP_TIMEOUT_MS = 500
+# Upper bound on waiting for a step that cannot be interrupted (MediaPipe init, opening
+# or releasing the camera, a model switch) once the window is closed, then terminate()
+CAMERA_BLOCKING_STEP_DEADLINE_MS = 5000
+
+
+def configure_opencv():
+    """
+    Turns on OpenCV's SIMD-optimized code paths and sizes its thread pool.
+
+    Capture, display and MediaPipe each run on their own threads already, so
+    OpenCV's parallel loops (cvtColor/resize on large frames) get half the cores
+    instead of oversubscribing all of them.
+    """
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+    logger.info("OpenCV: optimized=%s, threads=%s", cv2.useOptimized(), cv2.getNumThreads())
 
 
 class MainWindow(QMainWindow):
+    display_size_changed = Signal(int, int) # Video label contents size, for the display worker
+
     def __init__(self):
         super().__init__()
         
         # Initialize storage first
         self._widgets = {}
-        print(f"Debug: Widget dictionary initialized: {self._widgets}")
+        logger.debug("Widget dictionary initialized: %s", self._widgets)
         
         # --- Camera Thread Variables ---
         self.camera_thread = None
         self.camera_worker = None
+        # Display thread: converts/scales frames so the GUI thread only sets the pixmap
+        self.display_thread = None
+        self.display_worker = None
         self.is_camera_running = False
+        self.model_complexity = 0 # MediaPipe Pose model (Lite), switched live from the menu
+        self._active_model_complexity = None # Model the running worker actually uses
+        self._current_frame = None # Worker buffer backing the displayed QImage, held until the next frame
+        # QImage wrappers of the display worker's pooled buffers, keyed by buffer id.
+        # The pool only holds a few buffers and is reallocated on resize, so each
+        # buffer is wrapped once instead of once per frame.
+        self._qimage_cache = {}
+        self._display_size = None  # Cached video label size, updated on resize
 
         # Window setup
         self.setWindowTitle("Gait Analyzer")
@@ -60,6 +99,8 @@ class MainWindow(QMainWindow):
         self.video_label.setAlignment(Qt.AlignCenter)
         self.video_label.setStyleSheet("border: 1px solid black; background-color: #dddddd;")
         self.video_label.setMinimumSize(640, 480)
+        # Track label resizes (window or dock changes) instead of querying its size every frame
+        self.video_label.installEventFilter(self)
         # Set size policy to expanding so it takes available space
         # self.video_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
@@ -76,11 +117,12 @@ class MainWindow(QMainWindow):
         # --- Create and Add Sidebar ---
         self.create_sidebar()
         self.create_databar() # <-- *** ADDED THIS CALL ***
+        self.create_menus()
 
         # --- Status Bar ---
         self.statusBar().showMessage("Ready") # Good practice to have a status bar
 
-        print("Main window initialized.")
+        logger.info("Main window initialized.")
 
     @property
     def databar_content(self):
@@ -88,7 +130,7 @@ class MainWindow(QMainWindow):
         return self._widgets.get('databar')
 
     def create_sidebar(self):
-        print("Creating sidebar...")
+        logger.debug("Creating sidebar...")
         self.sidebar_dock = QDockWidget("Tools", self) # Title bar of the dock
         self.sidebar_dock.setObjectName("SidebarDockWidget")
         self.sidebar_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
@@ -97,47 +139,69 @@ class MainWindow(QMainWindow):
             sidebar_content = SidebarContentWidget(self.sidebar_dock) 
             self.sidebar_dock.setWidget(sidebar_content)
         except Exception as e:
-             print(f"Error creating or setting SidebarContentWidget: {e}")
+             logger.error("Error creating or setting SidebarContentWidget: %s", e)
              error_label = QLabel(f"Error loading sidebar content:\n{e}", self.sidebar_dock)
              self.sidebar_dock.setWidget(error_label)
 
 
         # Add the dock widget to the main window
         self.addDockWidget(Qt.LeftDockWidgetArea, self.sidebar_dock)
-        print("Sidebar added to the main window.")
+        logger.debug("Sidebar added to the main window.")
 
     def create_databar(self):
-        print("Creating data widget")
+        logger.debug("Creating data widget")
         self.databar_dock = QDockWidget("Tools", self)
         self.databar_dock.setObjectName("DataOutputWidget")
         self.databar_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
 
         try:
-            print("Creating DatabarContentWidget instance...")
+            logger.debug("Creating DatabarContentWidget instance...")
             # Create and store widget with explicit parent
             databar_widget = DatabarContentWidget(parent=self)
-            print(f"Debug: Created databar_content - type: {type(databar_widget)}")
-            print(f"Debug: databar_content value: {databar_widget}")
+            logger.debug("Created databar_content - type: %s", type(databar_widget))
+            logger.debug("databar_content value: %s", databar_widget)
             
             # Store in our widgets dictionary
             self._widgets['databar'] = databar_widget
             # Set as dock widget content
             self.databar_dock.setWidget(databar_widget)
             
-            print("DatabarContentWidget set as dock widget")
-            print(f"Debug: Widget parent after setting: {databar_widget.parent()}")
-            print(f"Debug: Is widget valid: {bool(databar_widget)}")
+            logger.debug("DatabarContentWidget set as dock widget")
+            logger.debug("Widget parent after setting: %s", databar_widget.parent())
+            logger.debug("Is widget valid: %s", bool(databar_widget))
         except Exception as e:
-            print(f"Error creating or setting DatabarContentWidget: {e}")
+            logger.error("Error creating or setting DatabarContentWidget: %s", e)
             error_label = QLabel(f"Error loading data content:\n{e}", self.databar_dock)
             self.databar_dock.setWidget(error_label)
 
 
         # Add the dock widget to the main window
         self.addDockWidget(Qt.RightDockWidgetArea, self.databar_dock)
-        print(f"Data output bar added to the main window. Final databar_content: {self.databar_content}")
-        print(f"Debug: Final widget from dictionary: {self._widgets.get('databar')}")
-
+        logger.debug("Data output bar added to the main window. Final databar_content: %s", self.databar_content)
+        logger.debug("Final widget from dictionary: %s", self._widgets.get('databar'))
+
+
+    def create_menus(self):
+        """Creates the menu bar, including the pose model selection."""
+        pose_menu = self.menuBar().addMenu("Pose Model")
+        self.pose_model_group = QActionGroup(self)
+        self.pose_model_group.setExclusive(True)
+        for label, complexity in POSE_MODELS:
+            action = QAction(label, self, checkable=True)
+            action.setData(complexity)
+            action.setChecked(complexity == self.model_complexity)
+            self.pose_model_group.addAction(action)
+            pose_menu.addAction(action)
+        self.pose_model_group.triggered.connect(self.on_pose_model_selected)
+
+    @Slot(QAction)
+    def on_pose_model_selected(self, action):
+        """Switches the MediaPipe model complexity, live if the camera is running."""
+        self.model_complexity = action.data()
+        logger.info("Pose model set to %s (model_complexity=%s).", action.text(), self.model_complexity)
+        if self.is_camera_running and self.camera_worker:
+            self.camera_worker.set_model_complexity(self.model_complexity)
+            self.statusBar().showMessage(f"Switching pose model to {action.text()}...")
 
     def toggle_camera(self):
         """Starts or stops the camera thread."""
@@ -148,40 +212,59 @@ class MainWindow(QMainWindow):
 
     def start_camera_thread(self):
         """Creates, configures, and starts the camera worker thread."""
-        print("Attempting to start camera thread...")
+        logger.info("Attempting to start camera thread...")
         if self.camera_thread is not None and self.camera_thread.isRunning():
-             print("Warning: Camera thread already seems to be running.")
+             logger.warning("Camera thread already seems to be running.")
              return
 
         # Clear previous thread/worker just in case (belt and suspenders)
         if self.camera_thread:
             self.camera_thread.quit()
             self.camera_thread.wait()
+        if self.display_thread:
+            self.display_thread.quit()
+            self.display_thread.wait()
 
         self.camera_thread = QThread(self)
         # Pass camera index, could be configurable later
-        self.camera_worker = CameraWorker(camera_index=0)
+        self.camera_worker = CameraWorker(camera_index=0, model_complexity=self.model_complexity)
 
         self.camera_worker.moveToThread(self.camera_thread)
 
+        self.display_thread = QThread(self)
+        self.display_worker = DisplayWorker(self.camera_worker)
+        self.display_worker.moveToThread(self.display_thread)
+
         # Debug prints to check databar_content state
         databar_widget = self.databar_content
-        print(f"Debug: databar_content property value: {databar_widget}")
-        print(f"Debug: databar_content property type: {type(databar_widget)}")
-        print(f"Debug: Raw widget dictionary value: {self._widgets.get('databar')}")
+        logger.debug("databar_content property value: %s", databar_widget)
+        logger.debug("databar_content property type: %s", type(databar_widget))
+        logger.debug("Raw widget dictionary value: %s", self._widgets.get('databar'))
         
         # Connect signals/slots
         self.camera_thread.started.connect(self.camera_worker.run)
-        self.camera_worker.frame_ready.connect(self.update_video_label)
+        # camera -> display thread (convert/scale) -> GUI thread (set pixmap)
+        # These always cross threads, so say so explicitly rather than relying on
+        # AutoConnection resolving it at emit time. The frame signals carry no payload:
+        # the receiver takes the newest frame from the sender's exchange.
+        self.camera_worker.frame_ready.connect(self.display_worker.convert_and_scale, type=Qt.QueuedConnection)
+        self.display_worker.frame_ready.connect(self.update_video_label, type=Qt.QueuedConnection)
+        self.display_size_changed.connect(self.display_worker.set_display_size, type=Qt.QueuedConnection)
+        self._display_size = self.video_label.contentsRect().size()
+        self.display_size_changed.emit(self._display_size.width(), self._display_size.height())
         
         # Use the databar widget from our property getter
         if databar_widget is not None:
-            print("Connecting landmarks_ready signal to databar widget")
-            self.camera_worker.landmarks_ready.connect(databar_widget.update_landmarks_display)
+            logger.debug("Connecting landmarks_ready signal to databar widget")
+            # The (33, 4) array is passed by reference, PySide6 does not copy Python objects
+            self.camera_worker.landmarks_ready.connect(databar_widget.update_landmarks_display, type=Qt.QueuedConnection)
         else:
-            print("Warning: DatabarContentWidget instance is None, cannot connect landmarks signal.")
+            logger.warning("DatabarContentWidget instance is None, cannot connect landmarks signal.")
         self.camera_worker.finished.connect(self.on_camera_worker_finished)
         self.camera_worker.error.connect(self.on_camera_error)
+        self.camera_worker.model_changed.connect(self.on_model_changed)
+        self.camera_worker.model_switch_failed.connect(self.on_model_switch_failed)
+        self._active_model_complexity = self.model_complexity
 
         # Proper cleanup connections
         self.camera_worker.finished.connect(self.camera_thread.quit)
@@ -189,20 +272,26 @@ class MainWindow(QMainWindow):
         self.camera_thread.finished.connect(self.camera_thread.deleteLater)
         # Also ensure thread reference is cleared on finish
         self.camera_thread.finished.connect(self._clear_thread_references)
+        # The display thread only lives as long as the camera worker
+        self.camera_worker.finished.connect(self.display_thread.quit)
+        self.display_thread.finished.connect(self.display_worker.deleteLater)
+        self.display_thread.finished.connect(self.display_thread.deleteLater)
+        self.display_thread.finished.connect(self._clear_display_thread_references)
 
 
+        self.display_thread.start()
         self.camera_thread.start()
 
         self.is_camera_running = True
         self.start_stop_button.setText("Stop Camera")
         self.start_stop_button.setEnabled(True)
         self.statusBar().showMessage("Camera Running...")
-        print("Camera thread started signal sent.")
+        logger.info("Camera thread started signal sent.")
 
 
     def stop_camera_thread(self):
         """Signals the camera worker to stop and handles UI state."""
-        print("Attempting to stop camera thread...")
+        logger.info("Attempting to stop camera thread...")
         if self.camera_worker:
             self.camera_worker.stop() # Signal the worker object to stop its loop
 
@@ -213,54 +302,107 @@ class MainWindow(QMainWindow):
         # The worker finishing will trigger on_camera_worker_finished for final UI state
 
 
-    @Slot(np.ndarray)
-    def update_video_label(self, frame):
-        """Updates the QLabel with the new frame received from the worker."""
+    @Slot()
+    def update_video_label(self):
+        """Updates the QLabel with the latest frame prepared by the display worker."""
         try:
-            if frame is None or frame.size == 0:
-                print("Warning: Received empty frame in update_video_label.")
-                return # Don't process empty frames
+            if self.display_worker is None:
+                return # Worker already torn down, late notification
 
-            # Convert BGR (OpenCV) to RGB (Qt)
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
+            frame = self.display_worker.take_latest()
+            if frame is None:
+                return # Already displayed, nothing newer since the last notification
 
-            # Create QImage
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-
-            # Create QPixmap from QImage
-            qt_pixmap = QPixmap.fromImage(qt_image)
-
-            # Scale pixmap to fit the label while maintaining aspect ratio
-            scaled_pixmap = qt_pixmap.scaled(self.video_label.size(),
-                                              Qt.KeepAspectRatio,
-                                              Qt.SmoothTransformation)
+            if frame.size == 0:
+                logger.warning("Received empty frame in update_video_label.")
+                return # Don't process empty frames
 
-            # Set the pixmap on the label
-            self.video_label.setPixmap(scaled_pixmap)
+            # The display worker already scaled the BGR frame to fit the label, and
+            # does not touch this buffer again until we take the next frame, so it
+            # is wrapped directly without a copy.
+            h, w, ch = frame.shape
+            self._current_frame = frame
+            qt_image = self._wrap_frame(frame)
+
+            # Keep the image's format, don't have Qt convert it up front
+            qt_pixmap = QPixmap.fromImage(qt_image, Qt.NoFormatConversion)
+            if w > self._display_size.width() or h > self._display_size.height():
+                # Frame scaled for the previous label size (resize in flight), fit it cheaply
+                qt_pixmap = qt_pixmap.scaled(self._display_size, Qt.KeepAspectRatio, Qt.FastTransformation)
+
+            # Set the pixmap on the label, no scaling needed on the GUI thread at steady state
+            self.video_label.setPixmap(qt_pixmap)
         except cv2.error as e:
-             print(f"OpenCV Error updating video label: {e}")
+             logger.error("OpenCV Error updating video label: %s", e)
              # Maybe show error on label itself if conversion fails often
              # self.video_label.setText(f"Display Error: {e}")
         except Exception as e:
             # Catch potential errors during QImage/QPixmap creation or scaling
-            print(f"Error updating video label: {e}")
+            logger.error("Error updating video label: %s", e)
             # Optionally reset label or show an error message
             self.video_label.setText(f"Error displaying frame")
 
 
+    def _wrap_frame(self, frame):
+        """Returns a cached QImage sharing memory with the given display buffer."""
+        cached = self._qimage_cache.get(id(frame))
+        if cached is not None and cached[0] is frame:
+            return cached[1]
+
+        h, w, ch = frame.shape
+        if any(buf.shape != frame.shape for buf, _ in self._qimage_cache.values()):
+            self._qimage_cache.clear() # Pool was reallocated for a new size, drop the old wrappers
+        # Format_BGR888 reads OpenCV's byte order directly, no BGR->RGB pass for display
+        qt_image = QImage(frame.data, w, h, ch * w, QImage.Format_BGR888)
+        # Keep the array with its QImage: it owns the memory and pins the id
+        self._qimage_cache[id(frame)] = (frame, qt_image)
+        return qt_image
+
+
+    def eventFilter(self, watched, event):
+        """Caches the video label size whenever it is resized."""
+        if watched is self.video_label and event.type() == QEvent.Resize:
+            self._display_size = self.video_label.contentsRect().size()
+            # Let the display worker know, it pre-scales frames for us
+            self.display_size_changed.emit(self._display_size.width(), self._display_size.height())
+        return super().eventFilter(watched, event)
+
+
     @Slot()
     def on_camera_worker_finished(self):
         """Cleans up and resets state after the camera worker finishes."""
-        print("Camera worker finished signal received in main thread.")
+        logger.info("Camera worker finished signal received in main thread.")
         self._reset_camera_ui()
 
 
+    @Slot(int)
+    def on_model_changed(self, model_complexity):
+        """Confirms a live pose model switch in the status bar."""
+        self._active_model_complexity = model_complexity
+        self.statusBar().showMessage(f"Camera Running... (pose model {self._pose_model_label(model_complexity)})")
+
+    @Slot(int, str)
+    def on_model_switch_failed(self, model_complexity, error_message):
+        """Reports a failed live model switch and puts the menu back on the model still in use."""
+        logger.error("Switching to pose model %s failed: %s", model_complexity, error_message)
+        active = self._active_model_complexity
+        if self.model_complexity == model_complexity and active is not None:
+            # Otherwise a newer selection is already pending, leave it alone
+            self.model_complexity = active
+            for action in self.pose_model_group.actions():
+                action.setChecked(action.data() == active)
+        self.statusBar().showMessage(
+            f"Could not load pose model {self._pose_model_label(model_complexity)}: {error_message}")
+
+    def _pose_model_label(self, model_complexity):
+        """Menu label of a model complexity, e.g. "Full"."""
+        return next((label for label, complexity in POSE_MODELS if complexity == model_complexity),
+                    str(model_complexity))
+
     @Slot(str)
     def on_camera_error(self, error_message):
         """Displays camera errors in the UI and resets state."""
-        print(f"Received camera error signal in main thread: {error_message}")
+        logger.error("Received camera error signal in main thread: %s", error_message)
         self.video_label.setText(f"Camera Error: {error_message}")
         self.statusBar().showMessage(f"Error: {error_message}")
         self._reset_camera_ui()
@@ -271,7 +413,7 @@ class MainWindow(QMainWindow):
 
     def _reset_camera_ui(self):
         """Resets the UI elements related to the camera state."""
-        print("Resetting camera UI elements.")
+        logger.debug("Resetting camera UI elements.")
         self.is_camera_running = False
         self.start_stop_button.setText("Start Camera")
         self.start_stop_button.setEnabled(True)
@@ -286,53 +428,105 @@ class MainWindow(QMainWindow):
     @Slot()
     def _clear_thread_references(self):
         """Slot connected to QThread.finished to clear references."""
-        print("QThread finished signal received. Clearing references.")
+        logger.debug("QThread finished signal received. Clearing references.")
         self.camera_thread = None
         self.camera_worker = None
-        print("Camera thread and worker references cleared.")
+        logger.debug("Camera thread and worker references cleared.")
+
+
+    @Slot()
+    def _clear_display_thread_references(self):
+        """Slot connected to the display QThread.finished to clear references."""
+        self.display_thread = None
+        self.display_worker = None
+        self._current_frame = None
+        self._qimage_cache.clear()
+        logger.debug("Display thread and worker references cleared.")
 
 
     def closeEvent(self, event):
         """Ensures the camera thread is stopped cleanly when the window closes."""
-        print("Close event triggered. Stopping camera if running...")
+        logger.info("Close event triggered. Stopping camera if running...")
         if self.is_camera_running and self.camera_worker:
-            print("Requesting camera worker stop...")
+            logger.debug("Requesting camera worker stop...")
             self.camera_worker.stop()  # Signal the worker loop to end
 
-            # Store local reference to thread before potential cleanup
+            # Store local references before potential cleanup
             camera_thread = self.camera_thread
+            camera_worker = self.camera_worker
             if camera_thread and camera_thread.isRunning():
-                print("Waiting for camera thread to finish...")
-                # Increased timeout slightly, adjust if needed
-                finished = camera_thread.wait(5000)  # 5 seconds timeout
+                logger.debug("Waiting for camera thread to finish...")
+                # The frame loop checks the stop request every frame, so this is short
+                finished = camera_thread.wait(CAMERA_STOP_TIMEOUT_MS)
+                if not finished and camera_worker.in_blocking_step():
+                    # MediaPipe init, opening the camera, model switches and the final
+                    # cleanup do not check the stop request and can each take seconds.
+                    # Terminating inside one may leave the camera open, so don't block
+                    # the GUI thread on it: hide now and close once the thread is done.
+                    logger.info("Camera worker is still opening or releasing resources, closing when it finishes.")
+                    self.hide()
+                    camera_thread.finished.connect(self.close)
+                    QTimer.singleShot(CAMERA_BLOCKING_STEP_DEADLINE_MS, self._terminate_camera_thread)
+                    event.ignore()
+                    return
                 if not finished:
-                    print("Warning: Camera thread did not finish gracefully on close. Terminating.")
+                    logger.warning("Camera thread still running %s ms after stop request on close. Forcing termination.",
+                                   CAMERA_STOP_TIMEOUT_MS)
                     camera_thread.terminate()  # Force stop if wait fails
                     camera_thread.wait()  # Wait after terminate ensure resources are released
                 else:
-                    print("Camera thread finished gracefully on close.")
+                    logger.debug("Camera thread finished gracefully on close.")
             else:
-                print("Camera thread was not running or already finished when closing.")
+                logger.debug("Camera thread was not running or already finished when closing.")
         else:
-            print("Camera was not running on close.")
+            logger.debug("Camera was not running on close.")
 
-        print("Accepting close event.")
+        display_thread = self.display_thread
+        if display_thread and display_thread.isRunning():
+            display_thread.quit()
+            display_thread.wait()
+
+        logger.debug("Accepting close event.")
         event.accept()  # Accept the close event to allow window to close
 
 
+    @Slot()
+    def _terminate_camera_thread(self):
+        """Deadline for a deferred close: terminates the camera thread if it is still running."""
+        camera_thread = self.camera_thread
+        if camera_thread is None or not camera_thread.isRunning():
+            return # Finished in time, close() already ran
+        logger.warning("Camera worker still busy %s ms after the window was closed. Forcing termination.",
+                       CAMERA_BLOCKING_STEP_DEADLINE_MS)
+        # Close exactly once, from here: the killed thread still emits finished
+        camera_thread.finished.disconnect(self.close)
+        camera_thread.terminate()
+        camera_thread.wait()
+        # The worker never got to emit its finished signal, so reset its state here
+        self._reset_camera_ui()
+        self.close()
+
+
 if __name__ == "__main__":
-    print("Initializing application...")
+    # Quiet by default: only warnings and errors. CORNEA_LOG_LEVEL=DEBUG (or INFO)
+    # brings back the detailed lifecycle messages while debugging.
+    logging.basicConfig(
+        level=os.environ.get("CORNEA_LOG_LEVEL", "WARNING").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    logger.info("Initializing application...")
+    configure_opencv()
     # Enable High DPI support - Important for modern displays
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
 
     app = QApplication(sys.argv)
 
-    print("Creating main window...")
+    logger.debug("Creating main window...")
     window = MainWindow()
     window.show() # Display the window
 
-    print("Starting application event loop...")
+    logger.debug("Starting application event loop...")
     exit_code = app.exec() # Start the Qt event loop
-    print(f"Application event loop finished with exit code: {exit_code}")
+    logger.info("Application event loop finished with exit code: %s", exit_code)
     sys.exit(exit_code) # Exit the script
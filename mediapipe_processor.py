@@ -1,9 +1,117 @@
 # mediapipe_processor.py
+import logging
+import os
+import threading
+import time
 import cv2
 import mediapipe as mp
 import numpy as np
+from mediapipe.tasks.python import BaseOptions
+from mediapipe.tasks.python import vision
 
-class MediaPipeProcessor:
+from overlay import draw_pose, connections_to_array
+from frame_buffers import fit_size
+
+logger = logging.getLogger(__name__)
+
+
+def landmarks_to_array(landmark_list):
+    """
+    Converts a MediaPipe NormalizedLandmarkList into a (N, 4) float32 array.
+
+    Columns are x, y, z and visibility, one row per landmark (N = 33 for Pose).
+    """
+    landmarks = landmark_list.landmark
+    return np.fromiter(
+        (v for lm in landmarks for v in (lm.x, lm.y, lm.z, lm.visibility)),
+        dtype=np.float32, count=len(landmarks) * 4).reshape(-1, 4)
+
+
+# Pose Landmarker (Tasks API) model bundles, one per model complexity.
+# Download them from the MediaPipe model page into this directory to use them.
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+POSE_LANDMARKER_MODELS = {
+    0: "pose_landmarker_lite.task",
+    1: "pose_landmarker_full.task",
+    2: "pose_landmarker_heavy.task",
+}
+
+
+def pose_landmarker_model_path(model_complexity, model_dir=MODEL_DIR):
+    """Returns the Pose Landmarker .task file for the complexity, or None if it is not installed."""
+    filename = POSE_LANDMARKER_MODELS.get(model_complexity)
+    if filename is None:
+        return None
+    path = os.path.join(model_dir, filename)
+    return path if os.path.isfile(path) else None
+
+
+class PoseProcessorBase:
+    """
+    Shared parts of the pose processors: inference preprocessing and drawing
+    landmarks with overlay.draw_pose using mediapipe's default pose style.
+    """
+    def __init__(self, inference_size=None):
+        # Frames larger than this (width, height) box are downscaled, keeping the
+        # aspect ratio, before inference. Landmarks come back normalized, so they
+        # are drawn on the full-size frame without rescaling.
+        self._inference_size = inference_size
+        self._small_buf = None
+        # Pose drawn by the last process_frame(), redrawn by draw_latest() in between
+        self._latest_landmarks = None
+
+        mp_pose = mp.solutions.pose
+        landmark_style = mp.solutions.drawing_styles.get_default_pose_landmarks_style()
+        # Skeleton drawing tables, built once
+        self._connections = connections_to_array(mp_pose.POSE_CONNECTIONS)
+        self._landmark_colors = np.array([landmark_style[lm].color for lm in mp_pose.PoseLandmark], np.uint8)
+        self._landmark_radii = np.array([landmark_style[lm].circle_radius for lm in mp_pose.PoseLandmark], np.int32)
+        self._line_thickness = 2
+
+    def _inference_image(self, frame):
+        """Returns the BGR frame to run inference on, downscaled to fit inference_size if needed."""
+        if not self._inference_size:
+            return frame
+        h, w = frame.shape[:2]
+        out_w, out_h = fit_size(w, h, *self._inference_size)
+        if out_w >= w:
+            return frame
+        if self._small_buf is None or self._small_buf.shape[:2] != (out_h, out_w):
+            self._small_buf = np.empty((out_h, out_w, 3), np.uint8)
+        # Resize before the colour conversion so that only the small image gets converted
+        cv2.resize(frame, (out_w, out_h), dst=self._small_buf, interpolation=cv2.INTER_AREA)
+        return self._small_buf
+
+    def draw_landmarks(self, frame: np.ndarray, landmarks):
+        """
+        Draws previously computed pose landmarks onto the frame, in place.
+
+        Args:
+            frame: The video frame (in BGR format from OpenCV), modified in place.
+            landmarks: A (33, 4) landmark array returned by process_frame (may be None).
+
+        Returns:
+            The annotated BGR image (the same array as frame).
+        """
+        annotated_image = frame # Draw straight into the caller's buffer, no per-frame copy
+
+        if landmarks is not None:
+            draw_pose(annotated_image, landmarks, self._connections,
+                      self._landmark_colors, self._landmark_radii, self._line_thickness)
+        else:
+            # Optional: Add text if no pose is detected
+            # cv2.putText(annotated_image, "No pose detected", (50, 50),
+            #             cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
+            pass
+
+        return annotated_image
+
+    def draw_latest(self, frame: np.ndarray):
+        """Draws the most recent pose onto the frame, in place, without running inference."""
+        return self.draw_landmarks(frame, self._latest_landmarks)
+
+
+class MediaPipeProcessor(PoseProcessorBase):
     """
     Handles MediaPipe Pose detection and visualization.
     """
@@ -14,7 +122,8 @@ class MediaPipeProcessor:
                  enable_segmentation=False, # Keep segmentation off for performance
                  smooth_segmentation=True,
                  min_detection_confidence=0.5,
-                 min_tracking_confidence=0.5):
+                 min_tracking_confidence=0.5,
+                 inference_size=(512, 512)):
         """
         Initializes the MediaPipe Pose solution.
 
@@ -26,11 +135,11 @@ class MediaPipeProcessor:
             smooth_segmentation: Whether to filter segmentation mask across frames.
             min_detection_confidence: Minimum confidence value ([0.0, 1.0]) for detection to be considered successful.
             min_tracking_confidence: Minimum confidence value ([0.0, 1.0]) for tracking landmarks. Higher values increase robustness but also latency.
+            inference_size: (width, height) box frames are downscaled to fit before inference, None to disable.
         """
-        print("Initializing MediaPipe Pose...")
+        logger.info("Initializing MediaPipe Pose...")
+        super().__init__(inference_size)
         self.mp_pose = mp.solutions.pose
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_drawing_styles = mp.solutions.drawing_styles
 
         self.pose = self.mp_pose.Pose(
             static_image_mode=static_image_mode,
@@ -41,23 +150,31 @@ class MediaPipeProcessor:
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
-        print("MediaPipe Pose initialized successfully.")
+        # RGB copy of the inference image, allocated once and reused (pose.process
+        # is synchronous, so the buffer is free again when it returns)
+        self._rgb_buf = None
+        logger.info("MediaPipe Pose initialized successfully.")
 
     def process_frame(self, frame: np.ndarray):
         """
         Processes a single frame to detect and draw pose landmarks.
+        The landmarks are drawn directly into the given frame.
 
         Args:
             frame: The input video frame (in BGR format from OpenCV).
 
         Returns:
             A tuple containing:
-            - annotated_image (np.ndarray): The frame with landmarks and connections drawn.
-            - results: The raw pose results object from MediaPipe (or None if processing failed).
+            - annotated_image (np.ndarray): The same frame with landmarks and connections drawn.
+            - landmarks (np.ndarray): (33, 4) x, y, z, visibility array, or None if
+              no pose was detected or processing failed.
         """
         try:
-            # 1. Convert the BGR image to RGB for MediaPipe.
-            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # 1. Downscale and convert the BGR image to RGB for MediaPipe.
+            source = self._inference_image(frame)
+            if self._rgb_buf is None or self._rgb_buf.shape != source.shape:
+                self._rgb_buf = np.empty_like(source)
+            image_rgb = cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
 
             # To improve performance, optionally mark the image as not writeable to
             # pass by reference.
@@ -66,37 +183,134 @@ class MediaPipeProcessor:
             # 2. Process the image and find pose landmarks.
             results = self.pose.process(image_rgb)
 
-            # 3. Prepare the frame for drawing (make a writeable copy in BGR).
-            # We draw on the original BGR frame format that OpenCV uses.
+            # 3. Unpack the landmarks once and draw them on the original BGR frame.
             image_rgb.flags.writeable = True # No longer needed
-            annotated_image = frame.copy() # Draw on a copy of the original BGR frame
-
-            # 4. Draw the pose annotation on the image if landmarks are detected.
-            if results.pose_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    image=annotated_image,
-                    landmark_list=results.pose_landmarks,
-                    connections=self.mp_pose.POSE_CONNECTIONS,
-                    landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
-                    # connection_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style() # You can customize connection style too
-                )
-            else:
-                # Optional: Add text if no pose is detected
-                # cv2.putText(annotated_image, "No pose detected", (50, 50),
-                #             cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
-                pass
-
-
-            return annotated_image, results # Return the annotated BGR image and the results object
+            landmarks = landmarks_to_array(results.pose_landmarks) if results.pose_landmarks else None
+            self._latest_landmarks = landmarks
+            annotated_image = self.draw_landmarks(frame, landmarks)
+
+            return annotated_image, landmarks # Return the annotated BGR image and the landmark array
 
         except Exception as e:
-            print(f"Error processing frame with MediaPipe: {e}")
-            # Return the original frame and None for results in case of error
+            logger.error("Error processing frame with MediaPipe: %s", e)
+            # Return the original frame and None for landmarks in case of error
             return frame, None
 
     def close(self):
         """Releases MediaPipe resources."""
-        print("Closing MediaPipe Pose resources...")
+        logger.debug("Closing MediaPipe Pose resources...")
         self.pose.close()
-        print("MediaPipe Pose resources closed.")
+        logger.info("MediaPipe Pose resources closed.")
+
 
+class PoseLandmarkerProcessor(PoseProcessorBase):
+    """
+    Pose detection with the MediaPipe Tasks PoseLandmarker in LIVE_STREAM mode.
+
+    Frames are submitted with detect_async() and results arrive on MediaPipe's
+    own thread, so inference on one frame overlaps with capturing the next.
+    process_frame() therefore draws the most recent result available, which
+    lags the submitted frame by about one inference, and only returns it the
+    first time it is drawn. Same interface as MediaPipeProcessor.
+    """
+    def __init__(self,
+                 model_asset_path,
+                 delegate=BaseOptions.Delegate.GPU,
+                 min_detection_confidence=0.5,
+                 min_presence_confidence=0.5,
+                 min_tracking_confidence=0.5,
+                 inference_size=(512, 512)):
+        """
+        Initializes the Pose Landmarker.
+
+        Args:
+            model_asset_path: Path to a pose_landmarker_*.task model bundle.
+            delegate: BaseOptions.Delegate.GPU or BaseOptions.Delegate.CPU. If the GPU
+                delegate cannot be created (no GPU support in this build or driver), the
+                CPU delegate is used instead.
+            min_detection_confidence: Minimum confidence value ([0.0, 1.0]) for pose detection.
+            min_presence_confidence: Minimum confidence value ([0.0, 1.0]) for pose presence.
+            min_tracking_confidence: Minimum confidence value ([0.0, 1.0]) for tracking landmarks.
+            inference_size: (width, height) box frames are downscaled to fit before inference, None to disable.
+        """
+        logger.info("Initializing MediaPipe Pose Landmarker (%s, %s)...", os.path.basename(model_asset_path), delegate.name)
+        super().__init__(inference_size)
+        self._result_lock = threading.Lock()
+        self._latest_result_ms = -1 # Timestamp of the frame _latest_landmarks were detected on
+        self._returned_result_ms = -1 # Timestamp of the last result process_frame returned
+        self._last_timestamp_ms = -1
+
+        def create(delegate):
+            options = vision.PoseLandmarkerOptions(
+                base_options=BaseOptions(model_asset_path=model_asset_path, delegate=delegate),
+                running_mode=vision.RunningMode.LIVE_STREAM,
+                num_poses=1,
+                min_pose_detection_confidence=min_detection_confidence,
+                min_pose_presence_confidence=min_presence_confidence,
+                min_tracking_confidence=min_tracking_confidence,
+                result_callback=self._on_result
+            )
+            return vision.PoseLandmarker.create_from_options(options)
+
+        try:
+            self.landmarker = create(delegate)
+        except Exception as e:
+            if delegate == BaseOptions.Delegate.CPU:
+                raise
+            # E.g. the pip wheels on Windows ship without GPU delegate support
+            logger.warning("GPU delegate unavailable (%s), falling back to the CPU delegate.", e)
+            delegate = BaseOptions.Delegate.CPU
+            self.landmarker = create(delegate)
+        self.delegate = delegate
+        logger.info("MediaPipe Pose Landmarker initialized successfully (%s).", delegate.name)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """Result callback, runs on a MediaPipe thread."""
+        if result.pose_landmarks:
+            pose = result.pose_landmarks[0]
+            landmarks = np.array(
+                [(lm.x, lm.y, lm.z, lm.visibility or 0.0) for lm in pose], dtype=np.float32)
+        else:
+            landmarks = None
+        with self._result_lock:
+            self._latest_landmarks = landmarks
+            self._latest_result_ms = timestamp_ms
+
+    def process_frame(self, frame: np.ndarray):
+        """
+        Submits a frame for detection and draws the latest available pose on it, in place.
+
+        Args:
+            frame: The input video frame (in BGR format from OpenCV).
+
+        Returns:
+            A tuple (annotated_image, landmarks) like MediaPipeProcessor.process_frame,
+            except that landmarks is None unless a result arrived since the last call.
+            The latest pose is drawn either way.
+        """
+        try:
+            # A fresh array per call: detection runs asynchronously on this image
+            image_rgb = cv2.cvtColor(self._inference_image(frame), cv2.COLOR_BGR2RGB)
+            # LIVE_STREAM requires strictly increasing timestamps
+            timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            self.landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb), timestamp_ms)
+
+            with self._result_lock:
+                landmarks = self._latest_landmarks
+                result_ms = self._latest_result_ms
+            annotated_image = self.draw_landmarks(frame, landmarks)
+            if result_ms <= self._returned_result_ms:
+                return annotated_image, None # Already returned, don't report it again
+            self._returned_result_ms = result_ms
+            return annotated_image, landmarks
+
+        except Exception as e:
+            logger.error("Error processing frame with MediaPipe Pose Landmarker: %s", e)
+            return frame, None
+
+    def close(self):
+        """Releases MediaPipe resources."""
+        logger.debug("Closing MediaPipe Pose Landmarker resources...")
+        self.landmarker.close()
+        logger.info("MediaPipe Pose Landmarker resources closed.")
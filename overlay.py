@@ -0,0 +1,147 @@
+# overlay.py
+"""
+Fast pose skeleton drawing, used instead of mediapipe's drawing_utils.
+
+drawing_utils loops over every landmark and connection in Python, issuing one
+cv2 call each. Here the whole skeleton is rasterized by a single Numba-compiled
+kernel working on the (N, 4) landmark array. The kernels release the GIL, so
+the display worker and GUI threads keep running while the camera thread draws.
+If Numba is not installed the same API falls back to plain cv2.line / cv2.circle
+calls.
+"""
+import logging
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.warning("Numba not available, pose overlay falls back to OpenCV drawing.")
+    NUMBA_AVAILABLE = False
+
+# Landmarks less visible than this are not drawn (same cut-off as drawing_utils)
+VISIBILITY_THRESHOLD = 0.5
+# drawing_utils' default connection colour (BGR)
+CONNECTION_COLOR = np.array((224, 224, 224), np.uint8)
+BORDER_COLOR = np.array((255, 255, 255), np.uint8)
+
+
+def connections_to_array(connections):
+    """Converts an iterable of (start, end) landmark index pairs into an (N, 2) int32 array."""
+    return np.array(sorted(connections), dtype=np.int32).reshape(-1, 2)
+
+
+def border_radius(radius):
+    """Radius of the white ring drawn around a landmark, matching drawing_utils."""
+    return max(radius + 1, int(radius * 1.2))
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, nogil=True)
+    def _fill_disc(image, cx, cy, radius, color):
+        h, w = image.shape[0], image.shape[1]
+        r2 = radius * radius
+        for y in range(max(cy - radius, 0), min(cy + radius + 1, h)):
+            dy = y - cy
+            for x in range(max(cx - radius, 0), min(cx + radius + 1, w)):
+                dx = x - cx
+                if dx * dx + dy * dy <= r2:
+                    image[y, x, 0] = color[0]
+                    image[y, x, 1] = color[1]
+                    image[y, x, 2] = color[2]
+
+    @njit(cache=True, nogil=True)
+    def _draw_line(image, x0, y0, x1, y1, thickness, color):
+        # Bresenham, stamping a square brush of the requested thickness at each step
+        h, w = image.shape[0], image.shape[1]
+        half = thickness // 2
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            for y in range(max(y0 - half, 0), min(y0 + half + 1, h)):
+                for x in range(max(x0 - half, 0), min(x0 + half + 1, w)):
+                    image[y, x, 0] = color[0]
+                    image[y, x, 1] = color[1]
+                    image[y, x, 2] = color[2]
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    @njit(cache=True, nogil=True)
+    def _draw_pose_kernel(image, landmarks, connections, colors, radii,
+                          thickness, visibility_threshold, line_color, border_color):
+        h, w = image.shape[0], image.shape[1]
+        n = landmarks.shape[0]
+        px = np.zeros(n, np.int64)
+        py = np.zeros(n, np.int64)
+        visible = np.zeros(n, np.bool_)
+        for i in range(n):
+            x = landmarks[i, 0]
+            y = landmarks[i, 1]
+            if landmarks[i, 3] < visibility_threshold or x < 0.0 or x > 1.0 or y < 0.0 or y > 1.0:
+                continue
+            px[i] = min(int(x * w), w - 1)
+            py[i] = min(int(y * h), h - 1)
+            visible[i] = True
+
+        for k in range(connections.shape[0]):
+            a = connections[k, 0]
+            b = connections[k, 1]
+            if a < n and b < n and visible[a] and visible[b]:
+                _draw_line(image, px[a], py[a], px[b], py[b], thickness, line_color)
+
+        for i in range(n):
+            if visible[i]:
+                r = radii[i]
+                _fill_disc(image, px[i], py[i], max(r + 1, int(r * 1.2)), border_color)
+                _fill_disc(image, px[i], py[i], r, colors[i])
+
+
+def draw_pose(image, landmarks, connections, colors, radii, thickness=2,
+              visibility_threshold=VISIBILITY_THRESHOLD):
+    """
+    Draws the pose skeleton into image, in place.
+
+    Args:
+        image: BGR uint8 image of shape (H, W, 3), modified in place.
+        landmarks: (N, 4) float32 array of normalized x, y, z, visibility.
+        connections: (M, 2) int32 array of landmark index pairs to join.
+        colors: (N, 3) uint8 array, BGR colour per landmark.
+        radii: (N,) int32 array, circle radius per landmark.
+        thickness: Line thickness in pixels for the connections.
+        visibility_threshold: Landmarks below this visibility are skipped.
+    """
+    if NUMBA_AVAILABLE:
+        _draw_pose_kernel(image, landmarks, connections, colors, radii, thickness,
+                          visibility_threshold, CONNECTION_COLOR, BORDER_COLOR)
+        return
+
+    # --- OpenCV fallback ---
+    h, w = image.shape[:2]
+    xy = landmarks[:, :2]
+    visible = ((landmarks[:, 3] >= visibility_threshold)
+               & (xy >= 0.0).all(axis=1) & (xy <= 1.0).all(axis=1))
+    points = np.minimum((xy * (w, h)).astype(np.int32), (w - 1, h - 1)).tolist()
+    line_color = tuple(int(c) for c in CONNECTION_COLOR)
+    for a, b in connections:
+        if a < len(points) and b < len(points) and visible[a] and visible[b]:
+            cv2.line(image, tuple(points[a]), tuple(points[b]), line_color, thickness)
+    border_color = tuple(int(c) for c in BORDER_COLOR)
+    for i in np.flatnonzero(visible):
+        center = tuple(points[i])
+        radius = int(radii[i])
+        cv2.circle(image, center, border_radius(radius), border_color, -1)
+        cv2.circle(image, center, radius, tuple(int(c) for c in colors[i]), -1)
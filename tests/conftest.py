@@ -0,0 +1,28 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# The modules under test live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_generate_tests(metafunc):
+    # Modules using the backend fixture name their module with a Numba kernel and
+    # its fallback as NUMBA_BACKEND = (module, "fallback name")
+    if "backend" in metafunc.fixturenames:
+        _, fallback = metafunc.module.NUMBA_BACKEND
+        metafunc.parametrize("backend", ["numba", fallback], indirect=True)
+
+
+@pytest.fixture
+def backend(request, monkeypatch):
+    """Runs a test against the module's Numba kernel and against its fallback."""
+    module, _ = request.module.NUMBA_BACKEND
+    if request.param == "numba":
+        if not module.NUMBA_AVAILABLE:
+            pytest.skip("Numba not installed")
+    else:
+        monkeypatch.setattr(module, "NUMBA_AVAILABLE", False)
+    return request.param
@@ -0,0 +1,41 @@
+# tests/test_frame_buffers.py
+from frame_buffers import FrameExchange
+
+SHAPE = (4, 6, 3)
+
+
+def test_acquire_skips_latest_and_held():
+    exchange = FrameExchange("test")
+    held = exchange.acquire(SHAPE)
+    exchange.publish(held)
+    assert exchange.take() is held
+    latest = exchange.acquire(SHAPE)
+    exchange.publish(latest)
+
+    # Only one buffer of the three is free, every acquire must return it
+    for _ in range(4):
+        buf = exchange.acquire(SHAPE)
+        assert buf is not latest
+        assert buf is not held
+
+
+def test_publish_notifies_only_when_slot_empty():
+    exchange = FrameExchange("test")
+    assert exchange.publish(exchange.acquire(SHAPE)) is True
+    assert exchange.publish(exchange.acquire(SHAPE)) is False # Notification still pending
+    exchange.take()
+    assert exchange.publish(exchange.acquire(SHAPE)) is True
+
+
+def test_take_moves_frame_to_held():
+    exchange = FrameExchange("test")
+    frame = exchange.acquire(SHAPE)
+    exchange.publish(frame)
+    assert exchange.take() is frame
+    assert exchange.take() is None # Slot emptied
+
+    # The taken frame stays reserved for the consumer until its next take
+    for _ in range(4):
+        buf = exchange.acquire(SHAPE)
+        assert buf is not frame
+        exchange.publish(buf)
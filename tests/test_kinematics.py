@@ -0,0 +1,53 @@
+# tests/test_kinematics.py
+import numpy as np
+import pytest
+
+import kinematics
+from kinematics import JOINT_NAMES, JOINT_TRIPLES, compute_joint_angles
+from overlay import VISIBILITY_THRESHOLD
+
+NUMBA_BACKEND = (kinematics, "numpy")
+
+TRIPLE = np.array([[0, 1, 2]], dtype=np.int32)
+
+
+def test_right_angle(backend):
+    coords = np.array([[1, 0, 0], [0, 0, 0], [0, 1, 0]], np.float32)
+    assert compute_joint_angles(coords, TRIPLE)[0] == pytest.approx(90.0, abs=1e-3)
+
+
+def test_collinear_points_give_straight_angle(backend):
+    coords = np.array([[-1, 0, 0], [0, 0, 0], [2, 0, 0]], np.float32)
+    assert compute_joint_angles(coords, TRIPLE)[0] == pytest.approx(180.0, abs=1e-3)
+
+
+def test_coincident_landmarks_give_zero(backend):
+    coords = np.array([[0.5, 0.5, 0], [0.5, 0.5, 0], [0.2, 0.9, 0]], np.float32)
+    angles = compute_joint_angles(coords, TRIPLE)
+    assert angles[0] == 0.0
+    assert not np.isnan(angles).any()
+
+
+def test_numba_and_numpy_agree(monkeypatch):
+    if not kinematics.NUMBA_AVAILABLE:
+        pytest.skip("Numba not installed")
+    coords = np.random.default_rng(0).random((33, 3), dtype=np.float32)
+    expected = compute_joint_angles(coords)
+    monkeypatch.setattr(kinematics, "NUMBA_AVAILABLE", False)
+    np.testing.assert_allclose(compute_joint_angles(coords), expected, atol=1e-2)
+
+
+def test_databar_hides_angles_below_visibility_threshold():
+    pytest.importorskip("PySide6")
+    from widgets.databar_widget import format_joint_angles
+
+    landmarks = np.random.default_rng(1).random((33, 4), dtype=np.float32)
+    landmarks[:, 3] = 1.0
+    hidden = 0 # Left Elbow
+    landmarks[JOINT_TRIPLES[hidden][2], 3] = VISIBILITY_THRESHOLD - 0.01
+
+    lines = format_joint_angles(landmarks).splitlines()
+    assert len(lines) == len(JOINT_NAMES)
+    assert lines[hidden] == f"{JOINT_NAMES[hidden]}: --"
+    shown = [line for i, line in enumerate(lines) if i != hidden]
+    assert all(line.endswith("°") for line in shown)
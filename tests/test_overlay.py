@@ -0,0 +1,75 @@
+# tests/test_overlay.py
+import numpy as np
+import pytest
+
+import overlay
+from overlay import draw_pose
+
+NUMBA_BACKEND = (overlay, "cv2")
+
+H, W = 24, 32
+PAD = 8
+
+
+def make_pose(points, visibility=1.0):
+    """(N, 4) landmark array for the given normalized (x, y) points."""
+    landmarks = np.zeros((len(points), 4), np.float32)
+    landmarks[:, :2] = points
+    landmarks[:, 3] = visibility
+    return landmarks
+
+
+def style(n, radius=2):
+    """Distinct landmark colours and equal radii for n landmarks."""
+    colors = np.array([(10 + i, 100 + i, 200 - i) for i in range(n)], np.uint8)
+    return colors, np.full(n, radius, np.int32)
+
+
+def test_drawing_at_the_edges_stays_in_bounds(backend):
+    # Draw into the middle of a larger canvas, anything written out of bounds lands in the padding
+    canvas = np.zeros((H + 2 * PAD, W + 2 * PAD, 3), np.uint8)
+    image = canvas[PAD:-PAD, PAD:-PAD]
+    landmarks = make_pose([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)])
+    connections = np.array([(0, 1), (1, 2), (2, 3), (3, 0), (0, 2)], np.int32)
+    colors, radii = style(4, radius=5)
+
+    draw_pose(image, landmarks, connections, colors, radii, thickness=5)
+
+    assert image.any()
+    border = canvas.copy()
+    border[PAD:-PAD, PAD:-PAD] = 0
+    assert not border.any()
+    # x = y = 1.0 is clamped onto the last pixel
+    assert (image[H - 1, W - 1] == colors[2]).all()
+
+
+def test_invisible_and_out_of_range_landmarks_are_skipped(backend):
+    image = np.zeros((H, W, 3), np.uint8)
+    landmarks = make_pose([(0.5, 0.5), (1.2, 0.5), (0.5, -0.1), (0.25, 0.25)])
+    landmarks[0, 3] = overlay.VISIBILITY_THRESHOLD - 0.1
+    landmarks[3, 3] = 0.0
+    connections = np.array([(0, 1), (1, 2), (2, 3), (3, 0)], np.int32)
+    colors, radii = style(4)
+
+    draw_pose(image, landmarks, connections, colors, radii)
+
+    assert not image.any()
+
+
+def test_numba_and_cv2_colour_the_same_centres(monkeypatch):
+    if not overlay.NUMBA_AVAILABLE:
+        pytest.skip("Numba not installed")
+    landmarks = make_pose([(0.2, 0.3), (0.7, 0.6), (0.5, 0.9)])
+    connections = np.array([(0, 1), (1, 2)], np.int32)
+    colors, radii = style(3, radius=3)
+    centres = [(min(int(y * H), H - 1), min(int(x * W), W - 1)) for x, y in landmarks[:, :2]]
+
+    kernel_image = np.zeros((H, W, 3), np.uint8)
+    draw_pose(kernel_image, landmarks, connections, colors, radii)
+    monkeypatch.setattr(overlay, "NUMBA_AVAILABLE", False)
+    cv2_image = np.zeros((H, W, 3), np.uint8)
+    draw_pose(cv2_image, landmarks, connections, colors, radii)
+
+    for i, (y, x) in enumerate(centres):
+        assert (kernel_image[y, x] == colors[i]).all()
+        assert (cv2_image[y, x] == colors[i]).all()
@@ -1,11 +1,59 @@
-# widgets/sidebar_widget.py or widgets/databar_widget.py (depending on intended use)
+# widgets/databar_widget.py
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QFrame, QSizePolicy,
+                               QPlainTextEdit)
+from PySide6.QtCore import Qt, QTimer, Slot # Import Slot for clarity
+import logging
+import time
+import numpy as np
+
+from kinematics import JOINT_NAMES, JOINT_TRIPLES, compute_joint_angles
+from overlay import VISIBILITY_THRESHOLD
+from widgets.styling import make_title_label
+
+logger = logging.getLogger(__name__)
+
+# Landmarks arrive at the inference rate; nobody reads text faster than this,
+# so updates closer together are coalesced into the newest one (100 ms = 10 Hz)
+LANDMARK_UPDATE_INTERVAL_NS = 100_000_000
+
+# MediaPipe pose landmark names, in landmark index order
+LANDMARK_NAMES = (
+    "Nose", "Left Eye Inner", "Left Eye", "Left Eye Outer", "Right Eye Inner",
+    "Right Eye", "Right Eye Outer", "Left Ear", "Right Ear", "Mouth Left",
+    "Mouth Right", "Left Shoulder", "Right Shoulder", "Left Elbow", "Right Elbow",
+    "Left Wrist", "Right Wrist", "Left Pinky", "Right Pinky", "Left Index",
+    "Right Index", "Left Thumb", "Right Thumb", "Left Hip", "Right Hip",
+    "Left Knee", "Right Knee", "Left Ankle", "Right Ankle", "Left Heel",
+    "Right Heel", "Left Foot Index", "Right Foot Index"
+)
+# One line template per landmark with the name already filled in
+_FMT_LINES = tuple(
+    f"{name}: x={{:.4f}}, y={{:.4f}}, z={{:.4f}}, visibility={{:.2f}}" for name in LANDMARK_NAMES
+)
+
+
+def format_joint_angles(landmarks):
+    """
+    Formats the joint angles of an (N, 4) landmark array, one joint per line.
+
+    Angles whose landmarks are not all visible enough are shown as "--".
+    Coordinates are normalized to the image, so the angles are those seen
+    in the (possibly non-square) image plane plus MediaPipe's relative depth.
+    """
+    if len(landmarks) <= JOINT_TRIPLES.max():
+        return "Not enough landmarks for joint angles."
 
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
-                               QFrame, QComboBox, QSpacerItem, QSizePolicy,
-                               QPlainTextEdit, QScrollArea) # Added QPlainTextEdit, QScrollArea for display
-from PySide6.QtCore import Qt, Slot # Import Slot for clarity
+    angles = compute_joint_angles(landmarks[:, :3]).tolist()
+    # A joint is only as reliable as its least visible landmark
+    visible = (landmarks[JOINT_TRIPLES, 3].min(axis=1) >= VISIBILITY_THRESHOLD).tolist()
+    return "\n".join(
+        f"{name}: {angle:.1f}\u00b0" if ok else f"{name}: --"
+        for name, angle, ok in zip(JOINT_NAMES, angles, visible)
+    )
 
-class DatabarContentWidget(QWidget): # Or SidebarContentWidget if this is truly the sidebar
+
+class DatabarContentWidget(QWidget):
     """
     A custom widget to hold the contents of a data display area, potentially
     including MediaPipe pose landmark information.
@@ -22,8 +70,7 @@ class DatabarContentWidget(QWidget): # Or SidebarContentWidget if this is truly
 
         # --- Static Top Elements ---
         # Renamed to be more general if used for different outputs
-        title_label = QLabel("Analysis/Data Output")
-        title_label.setStyleSheet("font-weight: bold; font-size: 14pt;")
+        title_label = make_title_label("Analysis/Data Output")
         self.main_layout.addWidget(title_label)
 
         line = QFrame()
@@ -31,6 +78,13 @@ class DatabarContentWidget(QWidget): # Or SidebarContentWidget if this is truly
         line.setFrameShadow(QFrame.Sunken)
         self.main_layout.addWidget(line)
 
+        # --- Section for Joint Angles ---
+        self.angles_title_label = QLabel("Joint Angles:")
+        self.main_layout.addWidget(self.angles_title_label)
+        self.angles_label = QLabel("No pose landmarks detected.")
+        self.angles_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.main_layout.addWidget(self.angles_label)
+
         # --- Section for Landmark Display ---
         # Added the creation and layout for the landmark display elements
         self.landmarks_title_label = QLabel("Pose Landmarks (first few):")
@@ -44,91 +98,104 @@ class DatabarContentWidget(QWidget): # Or SidebarContentWidget if this is truly
         self.main_layout.addWidget(self.landmarks_text_edit)
 
         # --- You can add other display elements here ---
-        # e.g., Labels for specific angle values, graphs, etc.
-        # self.angle_label = QLabel("Calculated Angle:")
-        # self.main_layout.addWidget(self.angle_label)
+        # e.g., graphs of the angles over time
 
         # Add stretch at the end to push content to the top
         self.main_layout.addStretch(1)
 
+        self._last_update_ns = 0 # monotonic time of the last landmark text update
+        # Newest landmarks received within the throttle interval, shown when it expires
+        self._pending_landmarks = None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_pending_landmarks)
 
-        print("Widget content initialized.")
+        logger.debug("Widget content initialized.")
 
-    @Slot(object) # Decorator specifying this method is a slot receiving an object
-    def update_landmarks_display(self, pose_landmarks_object):
+    @Slot(np.ndarray) # Decorator specifying this method is a slot receiving a numpy array
+    def update_landmarks_display(self, landmarks):
         """
         Receives pose landmarks from the worker and updates the display.
         This slot is called automatically when the landmarks_ready signal is emitted.
+
+        Args:
+            landmarks: (N, 4) array with x, y, z, visibility per landmark.
         """
-        # print("Widget: update_landmarks_display slot called.") # Debug print
+        # logger.debug("update_landmarks_display slot called.") # Debug print
+
+        # Throttle: skip the string building and text relayout between updates, but
+        # keep the newest landmarks and show them once the interval is up, so the
+        # last pose of a burst is never dropped
+        remaining_ns = LANDMARK_UPDATE_INTERVAL_NS - (time.monotonic_ns() - self._last_update_ns)
+        if remaining_ns > 0:
+            self._pending_landmarks = landmarks
+            if not self._flush_timer.isActive():
+                self._flush_timer.start(-(-remaining_ns // 1_000_000)) # Round up to whole ms
+            return
+        self._show_landmarks(landmarks)
+
+    @Slot()
+    def _flush_pending_landmarks(self):
+        """Shows the landmarks held back by the throttle."""
+        landmarks = self._pending_landmarks
+        if landmarks is not None:
+            self._show_landmarks(landmarks)
+
+    def _show_landmarks(self, landmarks):
+        """Updates the landmark text and joint angles, unthrottled."""
+        self._last_update_ns = time.monotonic_ns()
+        self._pending_landmarks = None
+        self._flush_timer.stop()
 
         # Check if the landmarks_text_edit was successfully created
         if not hasattr(self, 'landmarks_text_edit') or self.landmarks_text_edit is None:
-             print("Widget: landmarks_text_edit not initialized. Cannot update display.")
+             logger.error("landmarks_text_edit not initialized. Cannot update display.")
              return # Cannot update if the widget doesn't exist
 
-        if pose_landmarks_object is None:
+        if landmarks is None or len(landmarks) == 0:
             self.landmarks_text_edit.setPlainText("No pose landmarks detected.")
+            self.angles_label.setText("No pose landmarks detected.")
             return
 
-        # Check if the object has the expected 'landmark' attribute (it should be a list-like structure)
-        if not hasattr(pose_landmarks_object, 'landmark'):
+        # Check the array has the expected (N, 4) layout
+        if getattr(landmarks, 'ndim', None) != 2 or landmarks.shape[1] != 4:
              self.landmarks_text_edit.setPlainText("Received invalid landmark data structure.")
-             print("Widget: Received object without 'landmark' attribute.") # Debug print
+             logger.warning("Received landmarks with unexpected shape %s.", getattr(landmarks, 'shape', None))
              return
 
         # Prepare text to display
-        display_text = "Pose Landmarks:\n"
         # Iterate through the first few landmarks to display (e.g., first 10)
         # Ensure we don't try to access more landmarks than exist
-        num_landmarks_to_display = min(len(pose_landmarks_object.landmark), 10) # Display up to 10
-        # Add more names if displaying more landmarks
-        landmark_names = [
-            "Nose", "Left Eye Inner", "Left Eye", "Left Eye Outer", "Right Eye Inner",
-            "Right Eye", "Right Eye Outer", "Left Ear", "Right Ear", "Mouth Left",
-            "Mouth Right", "Left Shoulder", "Right Shoulder", "Left Elbow", "Right Elbow",
-            "Left Wrist", "Right Wrist", "Left Pinky", "Right Pinky", "Left Index",
-            "Right Index", "Left Thumb", "Right Thumb", "Left Hip", "Right Hip",
-            "Left Knee", "Right Knee", "Left Ankle", "Right Ankle", "Left Heel",
-            "Right Heel", "Left Foot Index", "Right Foot Index"
-        ]
-
-
-        for i in range(num_landmarks_to_display):
-            landmark = pose_landmarks_object.landmark[i]
-            # Use landmark name if available, otherwise use index
-            name = landmark_names[i] if i < len(landmark_names) else f"Landmark {i}"
-            display_text += f"{name}: x={landmark.x:.4f}, y={landmark.y:.4f}, z={landmark.z:.4f}, visibility={landmark.visibility:.2f}\n"
+        num_landmarks_to_display = min(len(landmarks), 10) # Display up to 10
+        # One tolist() turns the rows into plain floats (formatting numpy scalars
+        # is much slower), then the lines are joined in a single pass
+        rows = landmarks[:num_landmarks_to_display].tolist()
+        lines = ["Pose Landmarks:"]
+        lines.extend(
+            # Use the landmark's template if it has a name, otherwise label it by index
+            (_FMT_LINES[i] if i < len(_FMT_LINES) else f"Landmark {i}: x={{:.4f}}, y={{:.4f}}, z={{:.4f}}, visibility={{:.2f}}")
+            .format(*row)
+            for i, row in enumerate(rows)
+        )
 
         # Indicate if there are more landmarks than displayed
-        if len(pose_landmarks_object.landmark) > num_landmarks_to_display:
-             display_text += f"... + {len(pose_landmarks_object.landmark) - num_landmarks_to_display} more landmarks (total {len(pose_landmarks_object.landmark)})\n"
+        if len(landmarks) > num_landmarks_to_display:
+             lines.append(f"... + {len(landmarks) - num_landmarks_to_display} more landmarks (total {len(landmarks)})")
+        display_text = "\n".join(lines) + "\n"
 
-
-        # Update the text edit widget with the new data
+        # Update the text edit widget with the new data, repainting once at the end
+        self.landmarks_text_edit.setUpdatesEnabled(False)
         self.landmarks_text_edit.setPlainText(display_text)
+        self.landmarks_text_edit.setUpdatesEnabled(True)
+
+        # --- Joint angles ---
+        self.update_angles_display(landmarks)
+
+    def update_angles_display(self, landmarks):
+        """Computes the joint angles from an (N, 4) landmark array and shows them."""
+        self.angles_label.setText(format_joint_angles(landmarks))
 
-        # --- You would add logic here to calculate and display specific angles ---
-        # This involves accessing the coordinates of relevant landmarks (e.g., elbow = landmark[13])
-        # and performing geometric calculations.
-        # Remember to handle potential IndexError if fewer landmarks are detected than expected.
-        # Example (conceptual, assuming you have the angle calculation function):
-        # if len(pose_landmarks_object.landmark) > 15: # Ensure enough landmarks for left elbow angle
-        #     try:
-        #         left_shoulder = pose_landmarks_object.landmark[mp.solutions.pose.PoseLandmark.LEFT_SHOULDER.value]
-        #         left_elbow = pose_landmarks_object.landmark[mp.solutions.pose.PoseLandmark.LEFT_ELBOW.value]
-        #         left_wrist = pose_landmarks_object.landmark[mp.solutions.pose.PoseLandmark.LEFT_WRIST.value]
-        #         # You would need to implement calculate_angle_from_landmarks
-        #         # angle = calculate_angle_from_landmarks(left_shoulder, left_elbow, left_wrist)
-        #         # Apply smoothing (EMA) to the angle before displaying
-        #         # self.smoothed_left_elbow_angle = self.apply_smoothing(angle, self.smoothed_left_elbow_angle) # Assuming you have smoothing state and method
-        #         # self.angle_label.setText(f"Left Elbow Angle: {self.smoothed_left_elbow_angle:.2f}°")
-        #     except IndexError:
-        #         print("Not enough landmarks detected to calculate left elbow angle.")
-        #     except Exception as e:
-        #          print(f"Error calculating or displaying angle: {e}")
-
-    # Add a placeholder for your smoothing method if you implement angle calculation later
+    # Add a placeholder for your smoothing method if you want to smooth the angles
     # def apply_smoothing(self, new_value, current_smoothed_value, alpha=0.3):
     #     if current_smoothed_value is None:
     #         return new_value
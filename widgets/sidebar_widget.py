@@ -1,8 +1,24 @@
 # widgets/sidebar_widget.py
 
+import logging
+from functools import partial
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
-                               QFrame, QComboBox, QSpacerItem, QSizePolicy)
-from PySide6.QtCore import Qt, Slot # Import Slot for clarity
+                               QFrame, QComboBox, QStackedWidget)
+from PySide6.QtCore import Qt, Slot, QTimer # Import Slot for clarity
+
+from widgets.styling import make_title_label
+
+logger = logging.getLogger(__name__)
+
+# Buttons shown for each analysis type (the combo box userData)
+_PAGES = {
+    "gait": ("Gait Parameters", "Joint Angles", "Temporal-Spatial", "Export Gait Data"),
+    "form": ("Key Poses", "Range of Motion", "Compare Trials", "Export Form Data"),
+    "posture": ("Alignment Analysis", "Symmetry Check", "Posture Report"),
+    "fms": ("Deep Squat", "Hurdle Step", "Inline Lunge", "Shoulder Mobility", "ASLR",
+            "Trunk Stability", "Rotary Stability", "FMS Score"),
+}
+
 
 class SidebarContentWidget(QWidget):
     """
@@ -20,8 +36,7 @@ class SidebarContentWidget(QWidget):
         self.main_layout.setAlignment(Qt.AlignTop)
 
         # --- Static Top Elements ---
-        title_label = QLabel("Analysis Tools")
-        title_label.setStyleSheet("font-weight: bold; font-size: 14pt;")
+        title_label = make_title_label("Analysis Tools")
         self.main_layout.addWidget(title_label)
 
         # --- ComboBox (Needs to be instance variable to connect signal) ---
@@ -30,6 +45,8 @@ class SidebarContentWidget(QWidget):
         self.combo_box.addItem("Individual form", userData="form")
         self.combo_box.addItem("Posture Analysis", userData="posture")
         self.combo_box.addItem("FMS Suite", userData="fms")
+        # The items are fixed, so read their userData once (index -> analysis type)
+        self._types = [self.combo_box.itemData(i) for i in range(self.combo_box.count())]
         self.main_layout.addWidget(self.combo_box) # Add combo box to layout
 
         line = QFrame()
@@ -38,11 +55,19 @@ class SidebarContentWidget(QWidget):
         self.main_layout.addWidget(line)
 
         # --- Container for Dynamic Content ---
-        # We'll add buttons related to the combo box selection here
-        self.content_layout = QVBoxLayout() # Create a layout for dynamic content
-        self.content_layout.setSpacing(10) # Spacing for the dynamic buttons
-        # Add this dynamic layout to the main layout
-        self.main_layout.addLayout(self.content_layout)
+        # One page of buttons per analysis type; switching the combo box just flips
+        # the visible page, nothing is created or deleted. Each page is built the
+        # first time it is shown (see _page_for), not at startup, and nothing is
+        # built before the sidebar itself is first shown (see showEvent).
+        self.stack = QStackedWidget()
+        self._pages = {}
+        self._populated = False # Set once the sidebar has been shown and shows a page
+        self._current_type = None # Analysis type of the page currently shown
+        # Shown for a selection without a page, like the old content fallback
+        self._placeholder_page = QLabel("Select an analysis type.")
+        self._placeholder_page.setAlignment(Qt.AlignTop)
+        self.stack.addWidget(self._placeholder_page)
+        self.main_layout.addWidget(self.stack)
 
         # --- Static Bottom Elements ---
         self.main_layout.addStretch(1) # Pushes settings button to the bottom
@@ -53,66 +78,101 @@ class SidebarContentWidget(QWidget):
         self.main_layout.addWidget(settings_button)
 
         # --- Connect Signal to Slot ---
-        self.combo_box.currentIndexChanged.connect(self.update_sidebar_content)
-
-        # --- Initial Content Population ---
-        self.update_sidebar_content(self.combo_box.currentIndex()) # Populate with initial selection
-
-        print("SidebarContentWidget initialized.")
+        # Changes are applied from a zero-interval single-shot timer, so a burst of
+        # index changes (arrow keys, model refresh) switches the page only once
+        self._pending_index = None
+        self._switch_timer = QTimer(self)
+        self._switch_timer.setSingleShot(True)
+        self._switch_timer.setInterval(0)
+        self._switch_timer.timeout.connect(self._apply_pending_index)
+        self.combo_box.currentIndexChanged.connect(self._on_combo_index_changed)
+
+        logger.debug("SidebarContentWidget initialized.")
+
+    def showEvent(self, event):
+        """Shows the page for the current selection the first time the sidebar is shown."""
+        if not self._populated:
+            self._populated = True
+            self.update_sidebar_content(self.combo_box.currentIndex()) # Populate with initial selection
+        super().showEvent(event)
+
+    def _page_for(self, analysis_type):
+        """Returns the page for analysis_type, building and adding it on first use (None if unknown)."""
+        page = self._pages.get(analysis_type)
+        if page is not None or analysis_type not in _PAGES:
+            return page
+
+        # Build the page with painting suspended, so adding the buttons costs
+        # one relayout and repaint at the end instead of one per button
+        self.setUpdatesEnabled(False)
+        try:
+            page = self._build_page(analysis_type, _PAGES[analysis_type])
+            self._pages[analysis_type] = page
+            self.stack.addWidget(page)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.updateGeometry()
+        return page
+
+    def _build_page(self, analysis_type, button_texts):
+        """Creates a page widget with one button per entry, connected to on_dynamic_button_clicked."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10) # Spacing for the dynamic buttons
+        layout.setAlignment(Qt.AlignTop)
+        for button_text in button_texts:
+            button = QPushButton(button_text)
+            # Keep the button (and its ancestors) alien, a plain child never needs a native window
+            button.setAttribute(Qt.WA_DontCreateNativeAncestors, True)
+            # TODO: Connect these new buttons' clicked signals to actual actions!
+            # The partial carries which button it is, so the handler needs no sender() lookup
+            button.clicked.connect(partial(self.on_dynamic_button_clicked, analysis_type, button_text))
+            layout.addWidget(button)
+        return page
+
+    @Slot(int)
+    def _on_combo_index_changed(self, index):
+        """Records the newest combo index and schedules one page switch for the burst."""
+        self._pending_index = index
+        self._switch_timer.start() # Restarting a pending single-shot keeps it to one timeout
+
+    @Slot()
+    def _apply_pending_index(self):
+        """Applies the last combo index seen since the timer was started."""
+        index, self._pending_index = self._pending_index, None
+        if index is not None:
+            self.update_sidebar_content(index)
 
     @Slot(int) # Decorator clarifies this is a slot connected to a signal sending an int
     def update_sidebar_content(self, index):
+        """Shows the page for the analysis type selected in the combo box (the placeholder if it has none)."""
+        if not self._populated:
+            return # Not shown yet, showEvent applies the current selection
+        logger.debug("Combo box index changed to: %s", index)
+
+        selected_type = self._types[index] if 0 <= index < len(self._types) else None # The userData we stored
+        logger.debug("Selected type (userData): %s", selected_type)
+        if selected_type == self._current_type:
+            return # Already showing this page (e.g. the same index set again programmatically)
+
+        page = self._page_for(selected_type)
+        if page is None:
+            logger.warning("No sidebar page for analysis type: %s", selected_type)
+            page = self._placeholder_page
+        self.stack.setCurrentWidget(page)
+        self._current_type = selected_type
+
+    def on_dynamic_button_clicked(self, analysis_type, button_text, checked=False):
         """
-        Clears the current dynamic content and adds new widgets based
-        on the combo box selection.
+        Handles clicks for any of the dynamically generated buttons.
+
+        Args:
+            analysis_type: Key of the page the button is on (e.g. "gait").
+            button_text: Label of the clicked button.
+            checked: QPushButton.clicked's checked state (unused, the buttons are not checkable).
         """
-        print(f"Combo box index changed to: {index}")
-
-        # 1. Clear existing dynamic widgets from the content_layout
-        # Iterate backwards while removing items from the layout
-        while (item := self.content_layout.takeAt(0)) is not None:
-            if item.widget():
-                item.widget().deleteLater() # Important: properly delete the widget
-            # If you had nested layouts, you'd need to handle item.layout() too
-
-        # 2. Determine selected analysis type (using userData is convenient)
-        selected_type = self.combo_box.itemData(index) # Get the userData we stored
-        print(f"Selected type (userData): {selected_type}")
-
-        # 3. Define content for each type
-        new_buttons = []
-        if selected_type == "gait":
-            new_buttons = ["Gait Parameters", "Joint Angles", "Temporal-Spatial", "Export Gait Data"]
-        elif selected_type == "form":
-            new_buttons = ["Key Poses", "Range of Motion", "Compare Trials", "Export Form Data"]
-        elif selected_type == "posture":
-            new_buttons = ["Alignment Analysis", "Symmetry Check", "Posture Report"]
-        elif selected_type == "fms":
-            new_buttons = ["Deep Squat", "Hurdle Step", "Inline Lunge", "Shoulder Mobility", "ASLR", "Trunk Stability", "Rotary Stability", "FMS Score"]
-        else:
-            # Handle unexpected case or default
-            label = QLabel("Select an analysis type.")
-            self.content_layout.addWidget(label)
-            return # Nothing more to add
-
-        # 4. Create and add new buttons to the content_layout
-        for button_text in new_buttons:
-            button = QPushButton(button_text)
-            # TODO: Connect these new buttons' clicked signals to actual actions!
-            button.clicked.connect(self.on_dynamic_button_clicked) # Example connection
-            self.content_layout.addWidget(button) # Add to the dynamic layout
-
-        # Add a stretch at the end of dynamic content if needed,
-        # although the main layout's stretch might be sufficient.
-        # self.content_layout.addStretch(1)
-
-    @Slot() # Slot for the dynamically created buttons
-    def on_dynamic_button_clicked(self):
-        """Handles clicks for any of the dynamically generated buttons."""
-        # self.sender() returns the object that emitted the signal (the button)
-        button = self.sender()
-        if button:
-            print(f"Dynamic button clicked: {button.text()}")
-            # Add specific logic here based on button.text() or other properties
+        logger.debug("Dynamic button clicked: %s (%s)", button_text, analysis_type)
+        # Add specific logic here based on analysis_type / button_text
 
 
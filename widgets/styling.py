@@ -0,0 +1,25 @@
+# widgets/styling.py
+
+from PySide6.QtWidgets import QLabel
+
+
+def make_title_label(text, point_size=14):
+    """
+    Creates a bold label used as a panel title.
+
+    Styled with a QFont instead of a stylesheet: no QSS parse and re-polish of
+    the widget.
+
+    Args:
+        text: The title text.
+        point_size: Font size in points.
+
+    Returns:
+        The QLabel.
+    """
+    label = QLabel(text)
+    font = label.font()
+    font.setBold(True)
+    font.setPointSize(point_size)
+    label.setFont(font)
+    return label